@@ -1,5 +1,10 @@
+import asyncio
 import bcrypt
-from database import get_user
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from database import get_user, update_user_password
+from cache import LRUCache
 import jwt
 from datetime import datetime, timedelta
 from typing import Optional
@@ -8,9 +13,27 @@ from typing import Optional
 SECRET_KEY = "your-secret-key-here"  # TODO: Move to environment variable
 ALGORITHM = "HS256"
 
+# Short-lived cache of verified token payloads
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+
+token_cache = LRUCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+# bcrypt work factor; stored hashes with a different cost are rehashed on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads dedicated to hashing and how many more requests may wait for one
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending_hashes = 0
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued."""
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -21,26 +44,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         hashed_password.encode('utf-8')
     )
 
-def authenticate_user(username: str, password: str) -> Optional[dict]:
+def needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash was made with a different work factor than configured."""
+    try:
+        return int(hashed_password.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+async def _run_hasher(func, *args):
+    """Run a bcrypt call on the hashing pool, shedding load when the queue is full."""
+    global _pending_hashes
+    if _pending_hashes >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE:
+        raise PasswordHasherBusy()
+    
+    _pending_hashes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _pending_hashes -= 1
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_hasher(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
+def shutdown_hasher():
+    _hash_executor.shutdown(wait=True)
+
+async def authenticate_user(username: str, password: str) -> Optional[dict]:
     """
     Authenticate a user with their username (email) and password.
     Returns the user object if authentication is successful, None otherwise.
+    Raises PasswordHasherBusy when the hashing pool is saturated.
     """
-    user = get_user(username)
+    user = await get_user(username)
     if not user:
         return None
     
-    if not verify_password(password, user['hashed_password']):
+    if not await verify_password_async(password, user['hashed_password']):
         return None
     
+    # Upgrade hashes made with an outdated work factor while we have the password
+    if needs_rehash(user['hashed_password']):
+        try:
+            await update_user_password(username, await hash_password_async(password))
+        except PasswordHasherBusy:
+            pass
+    
     # Remove sensitive information before returning
     user.pop('hashed_password', None)
     return user
 
-def create_access_token(data: dict) -> str:
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(hours=24)  # Token expires in 24 hours
+    expire = datetime.utcnow() + (expires_delta or timedelta(hours=24))  # Token expires in 24 hours by default
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -53,4 +115,15 @@ def verify_token(token: str) -> Optional[dict]:
     except jwt.ExpiredSignatureError:
         return None
     except jwt.JWTError:
-        return None 
\ No newline at end of file
+        return None 
+
+def verify_token_cached(token: str) -> Optional[dict]:
+    """Verify a JWT token, reusing the payload of a recently verified token until it expires."""
+    payload = token_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
+    payload = verify_token(token)
+    if payload is not None:
+        token_cache.set(token, payload)
+    return payload
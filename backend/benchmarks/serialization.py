@@ -0,0 +1,85 @@
+"""
+Serialization and compression benchmark for analysis responses.
+
+Compares FastAPI's default JSONResponse with ORJSONResponse on documents shaped
+like the /upload, /compare/batch and /user/analyses responses, and shows the
+payload size with the negotiated compression applied. Returned dicts go through
+jsonable_encoder before the response class; these endpoints return an
+ORJSONResponse themselves, which skips it ("direct").
+
+    cd backend && python benchmarks/serialization.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import CATALOG
+from compression import AVAILABLE_ENCODINGS, compress
+from database import summarize_analysis
+from main import calculate_ats_score, compare_with_job
+
+def resume_text(skills):
+    return "\n".join([
+        "Jane Doe  jane.doe@example.com  555-123-4567",
+        "Education: BSc Computer Science, State University",
+        "Experience: Senior engineer, 6 years of work on data and web platforms",
+        "Skills and tools: " + ", ".join(skills)
+    ])
+
+def build_documents():
+    catalog = CATALOG.current()
+    skills = catalog.skills[:40]
+    text = resume_text(skills)
+    extracted = catalog.matcher.find(text)
+
+    upload = {"skills": extracted, "ats_analysis": calculate_ats_score(text, extracted)}
+    compare_batch = {
+        "extracted_skills": extracted,
+        "comparisons": {title: compare_with_job(text, extracted, title) for title in catalog.job_skills}
+    }
+
+    now = datetime.utcnow()
+    analyses = {
+        "analyses": [
+            summarize_analysis({
+                "_id": ObjectId(),
+                "filename": f"resume_{index}.pdf",
+                "created_at": now - timedelta(hours=index),
+                "analysis_data": {"job_title": title, **compare_batch["comparisons"][title]}
+            })
+            for index, title in enumerate(list(catalog.job_skills)[:20])
+        ],
+        "next_cursor": "MjAyNC0wMS0wMVQwMDowMDowMHw2NTVhYmM="
+    }
+    return {"/upload": upload, "/compare/batch": compare_batch, "/user/analyses": analyses}
+
+def per_call_ms(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+def main(number=200):
+    print(f"{'endpoint':<16}{'json ms':>10}{'orjson ms':>11}{'direct ms':>11}{'speedup':>9}{'bytes':>9}"
+          + "".join(f"{encoding + ' bytes':>12}{encoding + ' ms':>9}" for encoding in AVAILABLE_ENCODINGS))
+
+    for endpoint, document in build_documents().items():
+        # Both paths run jsonable_encoder first, as FastAPI does for returned dicts
+        before = per_call_ms(lambda: JSONResponse(jsonable_encoder(document)).body, number)
+        encoded = per_call_ms(lambda: ORJSONResponse(jsonable_encoder(document)).body, number)
+        direct = per_call_ms(lambda: ORJSONResponse(document).body, number)
+        body = ORJSONResponse(document).body
+        assert body == ORJSONResponse(jsonable_encoder(document)).body
+
+        row = f"{endpoint:<16}{before:>10.3f}{encoded:>11.3f}{direct:>11.3f}{before / direct:>8.0f}x{len(body):>9}"
+        for encoding in AVAILABLE_ENCODINGS:
+            compressed = compress(body, encoding)
+            row += f"{len(compressed):>12}{per_call_ms(lambda: compress(body, encoding), number):>9.3f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from chat_context import ChatContextIndex, SkillQuestionIndex
+from profile_index import (
+    JobProfile,
+    ProfileMatrix,
+    SkillContainmentIndex,
+    build_profile_index,
+    index_profiles_by_name
+)
+from skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+CATALOG_DIR = os.getenv("CATALOG_DIR", os.path.dirname(os.path.abspath(__file__)))
+# How often the catalog files are checked for changes; 0 disables reloading
+CATALOG_RELOAD_INTERVAL_SECONDS = float(os.getenv("CATALOG_RELOAD_INTERVAL_SECONDS", "5"))
+
+CATALOG_FILES = ("skills.json", "job_skills.json", "skill_categories.json", "industries.json")
+
+def keyword_category(skill: str) -> str:
+    """Categorize a lowercase skill by the keywords it contains"""
+    if any(tech in skill for tech in ["programming", "code", "software", "development", "engineering"]):
+        return "Technical"
+    if any(soft in skill for soft in ["communication", "leadership", "management", "team", "problem"]):
+        return "Soft Skills"
+    if any(tool in skill for tool in ["tool", "software", "platform", "system"]):
+        return "Tools"
+    return "Domain Knowledge"
+
+def normalize_name(name: str) -> str:
+    """The key a skill or role name is indexed by."""
+    return name.strip().lower()
+
+class CatalogSnapshot:
+    """
+    One version of the skill catalog with every index derived from it.
+    Snapshots are never modified; a reload builds a new one.
+    """
+
+    def __init__(self, data: Dict[str, object], version: str):
+        self.version = version
+        self.skills: List[str] = data["skills.json"]
+        self.job_skills: Dict[str, List[str]] = data["job_skills.json"]
+        self.skill_categories: Dict[str, Dict] = data["skill_categories.json"]
+        self.industries: Dict[str, Dict] = data["industries.json"]
+
+        # Skill matcher over every skill we know about
+        self.matcher = SkillMatcher(
+            self.skills + [
+                skill
+                for industry in self.industries.values()
+                for profiles in industry["job_profiles"].values()
+                for sub in profiles["sub_categories"]
+                for skill in sub["required_skills"] + sub["recommended_skills"]
+            ]
+        )
+
+        # Job profiles keyed by (industry, sub_category) with normalized skill sets
+        self.profiles: Mapping[Tuple[str, str], JobProfile] = build_profile_index(self.industries)
+        self.profiles_by_name: Mapping[str, JobProfile] = index_profiles_by_name(self.profiles)
+        # Substring containment between every catalog skill, for partial matching
+        self.containment = SkillContainmentIndex(self.matcher.canonical.keys())
+        self.profile_matrix = ProfileMatrix(self.profiles, self.containment)
+        # Keyword category of every catalog skill
+        self.keyword_categories = MappingProxyType(
+            {skill: keyword_category(skill) for skill in self.containment.skills}
+        )
+
+        self.job_skill_sets: Mapping[str, FrozenSet[str]] = MappingProxyType(
+            {title: frozenset(skills) for title, skills in self.job_skills.items()}
+        )
+
+        # Reverse indexes, keyed by the normalized skill name
+        categories_by_skill: Dict[str, List[str]] = {}
+        for category, category_data in self.skill_categories.items():
+            for skill in category_data["skills"]:
+                categories = categories_by_skill.setdefault(normalize_name(skill), [])
+                if category not in categories:
+                    categories.append(category)
+        self.categories_by_skill: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {skill: tuple(categories) for skill, categories in categories_by_skill.items()}
+        )
+
+        roles_by_skill: Dict[str, List[str]] = {}
+        for title, skills in self.job_skills.items():
+            for skill in skills:
+                roles = roles_by_skill.setdefault(normalize_name(skill), [])
+                if title not in roles:
+                    roles.append(title)
+        for profile in self.profiles.values():
+            for skill in profile.required_skills + profile.recommended_skills:
+                roles = roles_by_skill.setdefault(normalize_name(skill), [])
+                if profile.name not in roles:
+                    roles.append(profile.name)
+        self.roles_by_skill: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {skill: tuple(roles) for skill, roles in roles_by_skill.items()}
+        )
+
+        # Normalized name of every skill and role title to its catalog spelling;
+        # the matcher's spelling wins, as that is the one shown in analyses
+        names = dict(self.matcher.canonical)
+        for skills in list(self.job_skills.values()) + [data["skills"] for data in self.skill_categories.values()]:
+            for skill in skills:
+                names.setdefault(normalize_name(skill), skill.strip())
+        for name in list(self.job_skills) + list(self.profiles_by_name):
+            names.setdefault(normalize_name(name), name)
+        self.names: Mapping[str, str] = MappingProxyType(names)
+
+        # Chat lookups, built here so a reload prepares them off the event loop
+        self.chat_context = ChatContextIndex(self)
+        self.skill_questions = SkillQuestionIndex(self.job_skills)
+
+    def normalize(self, name: str) -> Optional[str]:
+        """The catalog spelling of a skill or role name, or None if it is unknown."""
+        return self.names.get(normalize_name(name))
+
+def load_snapshot(directory: str = CATALOG_DIR) -> CatalogSnapshot:
+    """Read the catalog files and build a snapshot; raises on missing or invalid files."""
+    digest = hashlib.sha256()
+    data = {}
+    for name in CATALOG_FILES:
+        with open(os.path.join(directory, name), "rb") as f:
+            raw = f.read()
+        digest.update(raw)
+        data[name] = json.loads(raw)
+    return CatalogSnapshot(data, digest.hexdigest()[:16])
+
+class Catalog:
+    """
+    The current catalog snapshot, reloaded when the files change on disk.
+
+    current() never blocks on a reload: at most once per check interval it
+    compares the files' modification times and, if they changed, rebuilds the
+    snapshot on a background thread. The new snapshot replaces the old one in
+    a single assignment once it is fully built, so a request holding a
+    snapshot always sees one consistent version. A file that fails to load
+    (e.g. half-written) keeps the previous snapshot in place.
+    """
+
+    def __init__(self, directory: str = CATALOG_DIR, reload_interval: float = CATALOG_RELOAD_INTERVAL_SECONDS):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._mtimes = self._file_mtimes()
+        self._snapshot = load_snapshot(directory)
+        self._next_check = time.monotonic() + reload_interval
+        self._reloading = threading.Lock()
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def _file_mtimes(self) -> Tuple[int, ...]:
+        return tuple(os.stat(os.path.join(self.directory, name)).st_mtime_ns for name in CATALOG_FILES)
+
+    def current(self) -> CatalogSnapshot:
+        if self.reload_interval > 0 and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.reload_interval
+            if self._reloading.acquire(blocking=False):
+                threading.Thread(target=self._reload_if_changed, daemon=True).start()
+        return self._snapshot
+
+    def _reload_if_changed(self):
+        try:
+            try:
+                mtimes = self._file_mtimes()
+            except OSError:
+                return
+            if mtimes != self._mtimes:
+                self.reload(mtimes)
+        finally:
+            self._reloading.release()
+
+    def reload(self, mtimes: Tuple[int, ...] = None) -> bool:
+        """Rebuild the snapshot from disk now; returns False if the files could not be loaded."""
+        try:
+            mtimes = mtimes or self._file_mtimes()
+            snapshot = load_snapshot(self.directory)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.reload_errors += 1
+            logger.warning("Catalog reload failed, keeping version %s: %s", self._snapshot.version, e)
+            return False
+
+        self._mtimes = mtimes
+        if snapshot.version != self._snapshot.version:
+            self._snapshot = snapshot
+            self.reloads += 1
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "version": self._snapshot.version,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors
+        }
+
+# Shared by the API and the chatbot
+CATALOG = Catalog()
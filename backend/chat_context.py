@@ -0,0 +1,125 @@
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from skill_matcher import SkillMatcher
+
+if TYPE_CHECKING:
+    from catalog import CatalogSnapshot
+
+# Order in which matched terms contribute facts when the budget is tight
+ROLE = 0
+PROFILE_GROUP = 1
+SKILL_CATEGORY = 2
+SKILL = 3
+
+# Questions answered from the catalog, matched against the whole normalized message;
+# anything else about a role (salaries, degrees, resume help...) goes to the model
+SKILL_QUESTION_TEMPLATES = [
+    r"what (?:are the )?(?:key |main |core |top )?skills (?:are |do i |would i )?(?:needed |required |need )?(?:for|to become|as) {role}",
+    r"(?:what|which) skills (?:does|do) {role} (?:need|require|use)",
+    r"(?:what|which) skills should i (?:learn|have|develop) (?:for|to become|as) {role}",
+    r"(?:list (?:the )?)?skills (?:needed|required) (?:for|to become|as) {role}",
+    r"(?:what are )?(?:the )?{role} skills"
+]
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for prompt budgets."""
+    return max(1, len(text) // 4)
+
+class SkillQuestionIndex:
+    """Recognizes questions about the skills of a catalog job title, e.g. "what skills does a <role> need?"."""
+
+    def __init__(self, job_titles: Iterable[str]):
+        titles = sorted(job_titles, key=len, reverse=True)
+        roles = "|".join(re.escape(title.lower()) for title in titles)
+        self._pattern = re.compile(
+            "|".join(
+                # Each template captures the role in its own group
+                f"(?:{template.format(role=f'(?:(?:a|an|the) )?(?P<role{index}>{roles})s?')})"
+                for index, template in enumerate(SKILL_QUESTION_TEMPLATES)
+            )
+        )
+        self._titles = {title.lower(): title for title in titles}
+
+    def job_title(self, message: str) -> Optional[str]:
+        """The job title a normalized message asks the skills of, or None if it is not such a question."""
+        match = self._pattern.fullmatch(message)
+        if not match:
+            return None
+        return self._titles[next(value for value in match.groupdict().values() if value)]
+
+class ChatContextIndex:
+    """
+    Short catalog facts for the chatbot prompt, indexed by the role, industry,
+    category and skill names they are about. The facts are rendered once when
+    the index is built; retrieval only matches names in the text.
+    """
+
+    def __init__(self, catalog: "CatalogSnapshot"):
+        self._facts: Dict[str, List[str]] = {}
+        self._rank: Dict[str, tuple] = {}
+
+        # Roles from the job skills list
+        for title, skills in catalog.job_skills.items():
+            self._add(title, ROLE, f"{title} requires: {', '.join(skills)}.")
+
+        # Roles from the industry job profiles
+        for industry, industry_data in catalog.industries.items():
+            profile_groups = industry_data["job_profiles"]
+            self._add(
+                industry, PROFILE_GROUP,
+                f"{industry} ({industry_data.get('description', '')}) job areas: {', '.join(profile_groups)}."
+            )
+            for group, group_data in profile_groups.items():
+                names = [profile["name"] for profile in group_data["sub_categories"]]
+                self._add(group, PROFILE_GROUP, f"{group} roles in {industry}: {', '.join(names)}.")
+
+        for profile in catalog.profiles.values():
+            fact = f"{profile.name} ({profile.industry} / {profile.category}) required skills: {', '.join(profile.required_skills)}"
+            if profile.recommended_skills:
+                fact += f"; recommended: {', '.join(profile.recommended_skills)}"
+            self._add(profile.name, ROLE, fact + ".")
+
+        for category, data in catalog.skill_categories.items():
+            self._add(category, SKILL_CATEGORY, f"{category} skills: {', '.join(data['skills'])}.")
+
+        # One fact per skill, from the snapshot's reverse indexes
+        for key in dict.fromkeys(list(catalog.roles_by_skill) + list(catalog.categories_by_skill)):
+            skill = catalog.names[key]
+            parts = []
+            if key in catalog.categories_by_skill:
+                parts.append(f"category {', '.join(catalog.categories_by_skill[key])}")
+            if key in catalog.roles_by_skill:
+                parts.append(f"used by {', '.join(catalog.roles_by_skill[key])}")
+            self._add(skill, SKILL, f"{skill}: {'; '.join(parts)}.")
+
+        self._matcher = SkillMatcher(self._facts)
+
+    def _add(self, name: str, kind: int, fact: str):
+        key = name.strip().lower()
+        self._rank.setdefault(key, (kind, len(self._rank)))
+        facts = self._facts.setdefault(key, [])
+        if fact not in facts:
+            facts.append(fact)
+
+    def retrieve(self, texts: Iterable[str], token_budget: int) -> List[str]:
+        """
+        Return the facts about the names mentioned in the texts, most relevant
+        first, within the token budget. Earlier texts take precedence.
+        """
+        facts = []
+        seen = set()
+        used = 0
+        for text in texts:
+            for key in sorted(self._matcher.find_keys(text), key=self._rank.__getitem__):
+                for fact in self._facts[key]:
+                    if fact in seen:
+                        continue
+                    cost = estimate_tokens(fact)
+                    if used + cost > token_budget:
+                        # A shorter fact may still fit
+                        continue
+                    seen.add(fact)
+                    facts.append(fact)
+                    used += cost
+        return facts
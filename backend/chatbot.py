@@ -1,22 +1,34 @@
 import os
-from openai import OpenAI
-from typing import Dict, List
+import asyncio
+import hashlib
+import time
+from openai import OpenAI, AsyncOpenAI
+from typing import AsyncIterator, Dict, List, Optional
 import json
+from cache import LRUCache
+from catalog import CATALOG, normalize_name
+from chat_context import estimate_tokens
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# Chat settings
+CHAT_BACKEND = os.getenv("CHAT_BACKEND", "openai")  # "openai" or "fake"
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-3.5-turbo")
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "16"))
+CHAT_QUEUE_TIMEOUT_SECONDS = float(os.getenv("CHAT_QUEUE_TIMEOUT_SECONDS", "2"))
+CHAT_TIMEOUT_SECONDS = float(os.getenv("CHAT_TIMEOUT_SECONDS", "30"))
+# Prompt token budgets for retrieved catalog facts and for conversation history
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "300"))
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1000"))
+# Cached answers and whether skill questions about known roles skip the model
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "1024"))
+CHAT_CACHE_TTL_SECONDS = float(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+CHAT_CATALOG_ANSWERS = os.getenv("CHAT_CATALOG_ANSWERS", "true").lower() == "true"
 
-# Load skills and job data
-with open("job_skills.json", "r") as f:
-    JOB_SKILLS = json.load(f)
+# OpenAI clients are created on first use so the app starts without an API key
+client: Optional[OpenAI] = None
+async_client: Optional[AsyncOpenAI] = None
 
-with open("skill_categories.json", "r") as f:
-    SKILL_CATEGORIES = json.load(f)
-
-def get_chatbot_response(message: str, context: Dict = None) -> str:
-    try:
-        # Prepare system message with context
-        system_message = """You are an AI career advisor and resume expert. You can help users with:
+# System prompt, built once; catalog facts are added per message
+SYSTEM_PROMPT = """You are an AI career advisor and resume expert. You can help users with:
         1. Resume improvement suggestions
         2. Skills needed for specific job roles
         3. Career advice and job market insights
@@ -24,58 +36,250 @@ def get_chatbot_response(message: str, context: Dict = None) -> str:
         5. Industry-specific resume guidance
         
         Use the provided job skills and categories data when relevant to give accurate, specific advice."""
-        
-        # Add context about available jobs and skills
-        system_message += f"\n\nAvailable job roles: {', '.join(JOB_SKILLS.keys())}"
-        
-        # Create the conversation
-        messages = [
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": message}
-        ]
-        
-        # If there's context from previous conversation, add it
-        if context and 'history' in context:
-            messages[1:1] = context['history'][-5:]  # Include last 5 messages for context
-        
+
+response_cache = LRUCache(maxsize=CHAT_CACHE_SIZE, ttl=CHAT_CACHE_TTL_SECONDS)
+chat_stats = {"catalog_answers": 0}
+
+class ChatBusy(Exception):
+    """Raised when every chat slot stays taken for longer than the queue timeout."""
+
+def get_client() -> OpenAI:
+    global client
+    if client is None:
+        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return client
+
+def get_async_client() -> AsyncOpenAI:
+    global async_client
+    if async_client is None:
+        async_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return async_client
+
+def trimmed_history(context: Dict = None) -> List[Dict]:
+    """The most recent history messages that fit in CHAT_HISTORY_TOKEN_BUDGET."""
+    history = context.get('history') if context else None
+    if not history:
+        return []
+
+    kept = []
+    used = 0
+    for item in reversed(history):
+        # A few tokens of overhead per message for the role and separators
+        cost = estimate_tokens(item.get('content') or '') + 4
+        if used + cost > CHAT_HISTORY_TOKEN_BUDGET:
+            break
+        kept.append(item)
+        used += cost
+    return kept[::-1]
+
+def system_prompt(message: str, history: List[Dict]) -> str:
+    """The system prompt with the catalog facts relevant to the message."""
+    # The previous user turn helps with follow-up questions
+    texts = [message]
+    for item in reversed(history):
+        if item.get('role') == 'user':
+            texts.append(item.get('content') or '')
+            break
+
+    facts = CATALOG.current().chat_context.retrieve(texts, CHAT_CONTEXT_TOKEN_BUDGET)
+    if not facts:
+        return SYSTEM_PROMPT
+    return SYSTEM_PROMPT + "\n\nRelevant catalog data:\n" + "\n".join(f"- {fact}" for fact in facts)
+
+def build_messages(message: str, context: Dict = None) -> List[Dict]:
+    # Create the conversation
+    history = trimmed_history(context)
+    return [
+        {"role": "system", "content": system_prompt(message, history)},
+        *history,
+        {"role": "user", "content": message}
+    ]
+
+def normalize_message(message: str) -> str:
+    return " ".join(message.lower().split()).rstrip("?!. ")
+
+def response_cache_key(message: str, context: Dict = None) -> str:
+    """
+    Cache key of an answer: the normalized message plus a hash of the history
+    sent with it, scoped to the catalog version the answer was based on.
+    """
+    history = json.dumps(trimmed_history(context), sort_keys=True)
+    history_hash = hashlib.sha256(history.encode('utf-8')).hexdigest()
+    return f"{CATALOG.current().version}|{normalize_message(message)}|{history_hash}"
+
+def answer_from_catalog(message: str, context: Dict = None) -> Optional[str]:
+    """Answer questions matching SKILL_QUESTION_TEMPLATES, e.g. "what skills does a <role> need?", from our job data."""
+    job_title = CATALOG.current().skill_questions.job_title(normalize_message(message))
+    if job_title is None:
+        return None
+
+    requirements = get_job_requirements(job_title)
+    answer = f"Key skills for a {job_title}: {', '.join(requirements['required_skills'])}."
+    if requirements["categories"]:
+        answer += f" These cover {', '.join(requirements['categories'])}."
+
+    current_skills = context.get("skills") if context else None
+    if current_skills:
+        improvements = suggest_skill_improvements(current_skills, job_title)
+        answer += f" You already have {round(improvements['completion_percentage'])}% of them."
+        missing = set(improvements["missing_skills"])
+        if missing:
+            # Keep the catalog's order so the answer is stable
+            next_skills = [skill for skill in requirements["required_skills"] if skill in missing]
+            answer += f" Skills to develop next: {', '.join(next_skills)}."
+    return answer
+
+def get_cached_answer(message: str, context: Dict = None) -> Optional[str]:
+    """Return a cached or catalog answer, or None if the model has to be asked."""
+    answer = response_cache.get(response_cache_key(message, context))
+    if answer is None and CHAT_CATALOG_ANSWERS:
+        answer = answer_from_catalog(message, context)
+        if answer is not None:
+            chat_stats["catalog_answers"] += 1
+    return answer
+
+def get_chat_stats() -> Dict:
+    stats = response_cache.stats()
+    # Every message is looked up in the cache once; catalog answers are counted as cache misses
+    messages = stats["hits"] + stats["misses"]
+    answered = stats["hits"] + chat_stats["catalog_answers"]
+    return {
+        **stats,
+        **chat_stats,
+        "answered_without_model_rate": round(answered / messages, 4) if messages else 0.0
+    }
+
+def get_chatbot_response(message: str, context: Dict = None) -> str:
+    answer = get_cached_answer(message, context)
+    if answer is not None:
+        return answer
+
+    try:
+        messages = build_messages(message, context)
+
         # Get response from OpenAI
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = get_client().chat.completions.create(
+            model=CHAT_MODEL,
             messages=messages,
             temperature=0.7,
             max_tokens=500
         )
-        
-        return response.choices[0].message.content
-        
+
+        answer = response.choices[0].message.content
+        response_cache.set(response_cache_key(message, context), answer)
+        return answer
+
     except Exception as e:
         return f"I apologize, but I encountered an error: {str(e)}"
 
+class OpenAIChatBackend:
+    """Streams completions from the OpenAI API."""
+
+    async def stream(self, messages: List[Dict]) -> AsyncIterator[str]:
+        response = await get_async_client().chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+class FakeChatBackend:
+    """Local stand-in for the model: streams a canned answer word by word, without network."""
+
+    def __init__(self, token_delay: float = float(os.getenv("FAKE_CHAT_TOKEN_DELAY_SECONDS", "0.01"))):
+        self.token_delay = token_delay
+
+    async def stream(self, messages: List[Dict]) -> AsyncIterator[str]:
+        answer = f"This is a test answer to: {messages[-1]['content']}"
+        for index, word in enumerate(answer.split(" ")):
+            await asyncio.sleep(self.token_delay)
+            yield word if index == 0 else f" {word}"
+
+CHAT_BACKENDS = {
+    "openai": OpenAIChatBackend,
+    "fake": FakeChatBackend
+}
+
+chat_backend = CHAT_BACKENDS[CHAT_BACKEND]()
+_chat_slots: Optional[asyncio.Semaphore] = None
+
+async def stream_chatbot_response(message: str, context: Dict = None) -> AsyncIterator[str]:
+    """
+    Stream the chatbot answer token by token. At most CHAT_MAX_CONCURRENCY
+    answers are generated at once; callers wait up to CHAT_QUEUE_TIMEOUT_SECONDS
+    for a slot before ChatBusy is raised. The whole answer must complete within
+    CHAT_TIMEOUT_SECONDS, otherwise asyncio.TimeoutError is raised.
+    Cached and catalog answers are returned at once as a single token.
+    """
+    global _chat_slots
+    answer = get_cached_answer(message, context)
+    if answer is not None:
+        yield answer
+        return
+
+    if _chat_slots is None:
+        _chat_slots = asyncio.Semaphore(CHAT_MAX_CONCURRENCY)
+
+    try:
+        await asyncio.wait_for(_chat_slots.acquire(), CHAT_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise ChatBusy()
+
+    tokens = None
+    parts = []
+    try:
+        deadline = time.monotonic() + CHAT_TIMEOUT_SECONDS
+        tokens = chat_backend.stream(build_messages(message, context)).__aiter__()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                token = await asyncio.wait_for(tokens.__anext__(), remaining)
+            except StopAsyncIteration:
+                break
+            parts.append(token)
+            yield token
+        response_cache.set(response_cache_key(message, context), "".join(parts))
+    finally:
+        if tokens is not None and hasattr(tokens, "aclose"):
+            await tokens.aclose()
+        _chat_slots.release()
+
 def get_job_requirements(job_title: str) -> Dict:
     """Get specific job requirements from our database."""
-    if job_title in JOB_SKILLS:
+    catalog = CATALOG.current()
+    if job_title in catalog.job_skills:
+        categories = set()
+        for skill in catalog.job_skills[job_title]:
+            categories.update(catalog.categories_by_skill.get(normalize_name(skill), ()))
         return {
-            "required_skills": JOB_SKILLS[job_title],
+            "required_skills": catalog.job_skills[job_title],
             "categories": {
                 category: skills
-                for category, skills in SKILL_CATEGORIES.items()
-                if any(skill in JOB_SKILLS[job_title] for skill in skills["skills"])
+                for category, skills in catalog.skill_categories.items()
+                if category in categories
             }
         }
     return None
 
 def suggest_skill_improvements(current_skills: List[str], target_job: str) -> Dict:
     """Suggest skills to develop for a specific job role."""
-    if target_job in JOB_SKILLS:
-        required_skills = set(JOB_SKILLS[target_job])
+    catalog = CATALOG.current()
+    if target_job in catalog.job_skills:
+        required_skills = catalog.job_skill_sets[target_job]
         current_skills_set = set(current_skills)
-        
+
         missing_skills = list(required_skills - current_skills_set)
         matching_skills = list(required_skills & current_skills_set)
-        
+
         return {
             "missing_skills": missing_skills,
             "matching_skills": matching_skills,
             "completion_percentage": len(matching_skills) / len(required_skills) * 100
         }
-    return None 
\ No newline at end of file
+    return None
@@ -0,0 +1,90 @@
+import gzip
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from http_cache import brotli, negotiate_encoding
+
+# Responses smaller than this are sent as they are
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+AVAILABLE_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+def is_compressible(content_type: str) -> bool:
+    """Text-like content worth compressing; PDFs, ZIPs and event streams are left alone."""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in ("application/json", "application/javascript", "application/xml", "image/svg+xml")
+    )
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL)
+
+class CompressionMiddleware:
+    """
+    Compresses single-body responses with br or gzip, as negotiated from
+    Accept-Encoding, once they reach the size threshold. Streamed responses
+    (event streams, ZIP downloads, large files), partial content and bodies
+    that already carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), AVAILABLE_ENCODINGS)
+        if encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        pending_start = None
+
+        async def send_compressed(message: Message):
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                # Hold the headers back until the first body chunk shows whether to compress
+                pending_start = message
+                return
+            if pending_start is None:
+                await send(message)
+                return
+
+            start, pending_start = pending_start, None
+            headers = MutableHeaders(raw=list(start["headers"]))
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or start["status"] == 206
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                # The compressed bytes differ, so a strong validator no longer applies
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+            await send({**start, "headers": headers.raw})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
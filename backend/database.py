@@ -1,41 +1,204 @@
-from pymongo import MongoClient
+import os
+import base64
+from typing import Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
 from bson import ObjectId
 from datetime import datetime
+from cache import LRUCache
 
-# MongoDB connection
-client = MongoClient('mongodb://localhost:27017/')
-db = client['resume_analyzer']
+# MongoDB connection settings
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
+MONGODB_DB = os.getenv("MONGODB_DB", "resume_analyzer")
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
 
-# Collections
-users = db.users
-resumes = db.resumes
-analyses = db.analyses
+# Short-lived cache of user documents loaded for authenticated requests
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+_client: Optional[AsyncIOMotorClient] = None
+user_cache = LRUCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+def connect_db() -> AsyncIOMotorClient:
+    """Create the shared MongoDB client; called from the app startup hook."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            MONGODB_URI,
+            maxPoolSize=MONGODB_MAX_POOL_SIZE,
+            minPoolSize=MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            connectTimeoutMS=MONGODB_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=MONGODB_SOCKET_TIMEOUT_MS
+        )
+    return _client
+
+def close_db():
+    """Close the shared MongoDB client; called from the app shutdown hook."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def get_db() -> AsyncIOMotorDatabase:
+    if _client is None:
+        raise RuntimeError("Database is not connected, call connect_db() first")
+    return _client[MONGODB_DB]
+
+async def ensure_indexes():
+    """Create the indexes the queries below rely on; safe to run on every startup."""
+    db = get_db()
+    await db.analyses.create_index([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)])
+    await db.users.create_index("email", unique=True)
 
 def serialize_object_id(obj):
     if isinstance(obj, ObjectId):
         return str(obj)
     return obj
 
-def create_user(email: str, hashed_password: str):
+async def create_user(email: str, hashed_password: str):
     user = {
         "email": email,
         "hashed_password": hashed_password,
         "created_at": datetime.utcnow()
     }
-    return users.insert_one(user)
+    result = await get_db().users.insert_one(user)
+    invalidate_user(email)
+    return result
+
+async def get_user(email: str):
+    return await get_db().users.find_one({"email": email})
 
-def get_user(email: str):
-    return users.find_one({"email": email})
+async def update_user_password(email: str, hashed_password: str):
+    result = await get_db().users.update_one(
+        {"email": email},
+        {"$set": {"hashed_password": hashed_password}}
+    )
+    invalidate_user(email)
+    return result
 
-def save_resume_analysis(user_id: str, filename: str, analysis_data: dict):
+async def get_principal(email: str) -> Optional[dict]:
+    """Get a user without the password hash, served from a short-lived cache."""
+    user = user_cache.get(email)
+    if user is None:
+        user = await get_user(email)
+        if user is None:
+            return None
+        user.pop("hashed_password", None)
+        user_cache.set(email, user)
+    return dict(user)
+
+def invalidate_user(email: str):
+    """Drop a cached user; call after any change to the user document."""
+    user_cache.pop(email)
+
+async def save_resume_analysis(user_id: str, filename: str, analysis_data: dict):
     analysis = {
         "user_id": ObjectId(user_id),
         "filename": filename,
         "analysis_data": analysis_data,
         "created_at": datetime.utcnow()
     }
-    return analyses.insert_one(analysis)
+    return await get_db().analyses.insert_one(analysis)
+
+# Fields returned when listing a user's analyses
+ANALYSIS_SUMMARY_PROJECTION = {
+    "filename": 1,
+    "created_at": 1,
+    "analysis_data.job_title": 1,
+    "analysis_data.job_titles": 1,
+    "analysis_data.match_percentage": 1,
+    "analysis_data.timestamp": 1,
+    "analysis_data.ats_analysis.overall_ats_score": 1,
+    "analysis_data.ats_analysis.format_score": 1,
+    "analysis_data.ats_analysis.skills_score": 1,
+    "analysis_data.ats_analysis.job_match_score": 1
+}
+
+def encode_cursor(created_at: datetime, analysis_id: ObjectId) -> str:
+    raw = f"{created_at.isoformat()}|{analysis_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a pagination cursor, raising ValueError if it is malformed."""
+    try:
+        created_at, analysis_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), ObjectId(analysis_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def summarize_analysis(analysis: dict) -> dict:
+    data = analysis.get("analysis_data", {})
+    ats = data.get("ats_analysis", {})
+    return {
+        "_id": str(analysis["_id"]),
+        "filename": analysis.get("filename"),
+        "job_title": data.get("job_title"),
+        "job_titles": data.get("job_titles"),
+        "scores": {
+            "overall_ats_score": ats.get("overall_ats_score"),
+            "format_score": ats.get("format_score"),
+            "skills_score": ats.get("skills_score"),
+            "job_match_score": ats.get("job_match_score"),
+            "match_percentage": data.get("match_percentage")
+        },
+        "timestamp": data.get("timestamp") or analysis["created_at"].isoformat()
+    }
+
+async def get_user_analyses(user_id: str, limit: int = 20, cursor: Optional[str] = None) -> Dict:
+    """
+    Return one page of a user's analysis summaries, newest first, and the
+    cursor of the next page (None on the last page).
+    """
+    query = {"user_id": ObjectId(user_id)}
+    if cursor:
+        created_at, analysis_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": analysis_id}}
+        ]
+
+    page = await get_db().analyses.find(query, ANALYSIS_SUMMARY_PROJECTION) \
+        .sort([("created_at", DESCENDING), ("_id", DESCENDING)]) \
+        .limit(limit + 1) \
+        .to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["_id"])
+
+    return {
+        "analyses": [summarize_analysis(analysis) for analysis in page],
+        "next_cursor": next_cursor
+    }
+
+async def get_analysis(analysis_id: str) -> Optional[dict]:
+    if not ObjectId.is_valid(analysis_id):
+        return None
+    analysis = await get_db().analyses.find_one({"_id": ObjectId(analysis_id)})
+    if analysis is None:
+        return None
+    return {**analysis, "_id": str(analysis["_id"]), "user_id": str(analysis["user_id"])}
+
+async def ensure_resume_cache_index(ttl_seconds: int):
+    await get_db().resume_cache.create_index("created_at", expireAfterSeconds=ttl_seconds)
+
+async def get_cached_resume(content_hash: str):
+    entry = await get_db().resume_cache.find_one({"_id": content_hash})
+    return entry["parsed"] if entry else None
 
-def get_user_analyses(user_id: str):
-    user_analyses = analyses.find({"user_id": ObjectId(user_id)}).sort("created_at", -1)
-    return list(map(lambda x: {**x, "_id": str(x["_id"]), "user_id": str(x["user_id"])}, user_analyses)) 
\ No newline at end of file
+async def save_cached_resume(content_hash: str, parsed: dict):
+    return await get_db().resume_cache.replace_one(
+        {"_id": content_hash},
+        {"_id": content_hash, "parsed": parsed, "created_at": datetime.utcnow()},
+        upsert=True
+    )
@@ -0,0 +1,166 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+def not_modified(etag: str, headers: Dict[str, str] = None) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end) offsets.
+    Returns None for ranges we do not serve partially (multiple ranges,
+    other units); raises ValueError for unsatisfiable ranges.
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+def ranged_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    etag: str,
+    filename: str = None,
+    headers: Dict[str, str] = None
+) -> Response:
+    """
+    Serve a file with ETag validation and single-range support:
+    304 when If-None-Match matches, 206 for a satisfiable Range,
+    416 for an unsatisfiable one, and the full file otherwise.
+    """
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", **(headers or {})}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+
+    size = os.path.getsize(path)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        if byte_range is not None:
+            start, end = byte_range
+            with open(path, "rb") as f:
+                f.seek(start)
+                content = f.read(end - start + 1)
+            return Response(
+                content,
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"}
+            )
+
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+def iter_bytes(data: bytes, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield a byte string in chunks for a StreamingResponse."""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+class PreparedResponse:
+    """
+    A JSON payload serialized once, with gzip and (if available) brotli
+    variants compressed ahead of time and a strong ETag per variant.
+    """
+
+    def __init__(self, content: Any, media_type: str = "application/json"):
+        self.media_type = media_type
+        # Same encoding as FastAPI's JSONResponse
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        self.bodies = {"identity": body}
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(body)
+        for encoding, data in compressed.items():
+            # Tiny payloads can grow when compressed
+            if len(data) < len(body):
+                self.bodies[encoding] = data
+
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+def negotiate_encoding(accept_encoding: str, available) -> str:
+    """Pick the best content coding the client accepts: br, then gzip, then identity."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+def prepared_response(request: Request, prepared: PreparedResponse, cache_control: str) -> Response:
+    """
+    Serve a PreparedResponse in the encoding negotiated from Accept-Encoding,
+    answering 304 when If-None-Match holds the ETag of any of its variants.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), prepared.bodies)
+    etag = prepared.etags[encoding]
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    if any(etag_matches(request, tag) for tag in prepared.etags.values()):
+        return not_modified(etag, headers)
+
+    headers["ETag"] = etag
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(prepared.bodies[encoding], media_type=prepared.media_type, headers=headers)
@@ -1,27 +1,64 @@
 # backend/main.py
-from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Header
+from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Header, Query, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import pdfplumber
 import json 
 import re
 import os
-from typing import List, Dict, Optional
+import asyncio
+from typing import List, Dict, Optional, FrozenSet, Union
 from datetime import datetime, timedelta
 from auth import (
     authenticate_user,
     create_access_token,
     verify_token,
-    hash_password
+    verify_token_cached,
+    token_cache,
+    hash_password_async,
+    shutdown_hasher,
+    PasswordHasherBusy
 )
-from database import save_resume_analysis, get_user_analyses, create_user, get_user
+from database import (
+    save_resume_analysis,
+    get_user_analyses,
+    create_user,
+    get_user,
+    get_principal,
+    user_cache,
+    ensure_resume_cache_index,
+    get_cached_resume,
+    save_cached_resume,
+    get_analysis,
+    ensure_indexes,
+    connect_db,
+    close_db
+)
+from pymongo.errors import DuplicateKeyError
 from pdf_generator import create_pdf_report
-from resume_generator import generate_resume
+from report_store import ReportStore, report_key
+from http_cache import PreparedResponse, prepared_response, ranged_file_response, iter_bytes
+from resume_generator import (
+    generate_resume,
+    generate_resume_async,
+    generate_resumes_zip,
+    tailor_resume_data,
+    get_executor as get_resume_executor,
+    shutdown as shutdown_resume_workers
+)
+from resume_document import ResumeDocument
+from resume_parser import PDFExtractionError, extract_text_async, shutdown as shutdown_parser
+from cache import LRUCache
+from chatbot import ChatBusy, stream_chatbot_response, get_chat_stats
+from render_jobs import LocalJobBackend, JobQueueFull, SUCCEEDED, FAILED
+from compression import CompressionMiddleware
+from uploads import CheckedUpload, IncompletePDF, NotAPDF, UploadLimitMiddleware, receive_pdf
+from catalog import CATALOG, CatalogSnapshot, keyword_category, normalize_name
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Get the current directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -30,6 +67,13 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 
+# Reject oversized uploads before their body is received in full
+# (added first so the middleware below wraps it and its 413s carry CORS headers)
+app.add_middleware(UploadLimitMiddleware)
+
+# Compress JSON and text responses for clients that accept it
+app.add_middleware(CompressionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -39,19 +83,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load skills list and job skills
-with open(os.path.join(BASE_DIR, "skills.json"), "r") as f:
-    SKILLS = json.load(f)
+# Pre-rendered analysis reports keyed by their content
+REPORT_STORE = ReportStore(
+    os.getenv("REPORT_STORE_DIR", os.path.join(BASE_DIR, "report_store")),
+    max_bytes=int(os.getenv("REPORT_STORE_MAX_MB", "256")) * 1024 * 1024,
+    max_age_seconds=int(os.getenv("REPORT_STORE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+)
+
+# Parsed resumes keyed by a hash of the uploaded bytes
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+RESUME_CACHE_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", "3600"))
+RESUME_CACHE_PERSIST = os.getenv("RESUME_CACHE_PERSIST", "false").lower() == "true"
+
+RESUME_CACHE = LRUCache(maxsize=RESUME_CACHE_SIZE, ttl=RESUME_CACHE_TTL_SECONDS)
+resume_cache_stats = {"persistent_hits": 0}
 
-with open(os.path.join(BASE_DIR, "job_skills.json"), "r") as f:
-    JOB_SKILLS = json.load(f)
+# Catalog endpoint payloads, serialized and compressed once per catalog version
+CATALOG_RESPONSE_MAX_AGE_SECONDS = int(os.getenv("CATALOG_RESPONSE_MAX_AGE_SECONDS", "300"))
+CATALOG_RESPONSES = LRUCache(maxsize=int(os.getenv("CATALOG_RESPONSE_CACHE_SIZE", "128")))
 
-with open(os.path.join(BASE_DIR, "skill_categories.json"), "r") as f:
-    SKILL_CATEGORIES = json.load(f)
+# Background rendering of PDFs on the resume worker pool, polled by job ID
+RENDER_JOBS = LocalJobBackend(get_resume_executor)
 
-# Load industry data
-with open(os.path.join(BASE_DIR, 'industries.json'), 'r') as f:
-    industries_data = json.load(f)
+@app.on_event("startup")
+async def startup():
+    connect_db()
+    await ensure_indexes()
+    if RESUME_CACHE_PERSIST:
+        await ensure_resume_cache_index(RESUME_CACHE_TTL_SECONDS)
+
+@app.on_event("shutdown")
+def shutdown():
+    shutdown_parser()
+    shutdown_resume_workers()
+    RENDER_JOBS.shutdown()
+    shutdown_hasher()
+    close_db()
 
 # Auth models
 class UserLogin(BaseModel):
@@ -66,6 +133,14 @@ class ResumeData(BaseModel):
     jobRole: str
     resumeData: dict
 
+class ChatMessage(BaseModel):
+    message: str
+    context: Optional[dict] = None
+
+class BatchResumeData(BaseModel):
+    roles: List[str]
+    resumeData: dict
+
 # Constants
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
@@ -74,7 +149,7 @@ security = HTTPBearer()
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Get the current user from the JWT token."""
     token = credentials.credentials
-    payload = verify_token(token)
+    payload = verify_token_cached(token)
     if payload is None:
         raise HTTPException(
             status_code=401,
@@ -82,7 +157,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = get_user(payload.get("sub"))
+    # Cached user document, without sensitive information
+    user = await get_principal(payload.get("sub"))
     if user is None:
         raise HTTPException(
             status_code=401,
@@ -90,36 +166,52 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Remove sensitive information
-    user.pop("hashed_password", None)
     return user
 
+def server_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
 # Register new user function
-def register_new_user(email: str, password: str) -> dict:
+async def register_new_user(email: str, password: str) -> dict:
     """Register a new user with email and password."""
-    if get_user(email):
+    if await get_user(email):
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
-    hashed_password = hash_password(password)
-    user_id = create_user(email, hashed_password)
+    hashed_password = await hash_password_async(password)
+    try:
+        user_id = await create_user(email, hashed_password)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=400,
+            detail="Email already registered"
+        )
     return {"id": str(user_id.inserted_id), "email": email}
 
 @app.post("/register")
 async def register(user_data: UserRegister):
     try:
-        user = register_new_user(user_data.email, user_data.password)
+        user = await register_new_user(user_data.email, user_data.password)
         return {"message": "User registered successfully"}
     except HTTPException as e:
         raise e
+    except PasswordHasherBusy:
+        raise server_busy()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/login")
 async def login(user_data: UserLogin):
-    user = authenticate_user(user_data.email, user_data.password)
+    try:
+        user = await authenticate_user(user_data.email, user_data.password)
+    except PasswordHasherBusy:
+        raise server_busy()
     if not user:
         raise HTTPException(
             status_code=401,
@@ -138,40 +230,67 @@ async def login(user_data: UserLogin):
     }
 
 @app.get("/user/analyses")
-async def get_analyses(current_user: dict = Depends(get_current_user)):
-    analyses = get_user_analyses(str(current_user["_id"]))
-    return {"analyses": analyses}
+async def get_analyses(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """List the current user's analysis summaries, newest first, one page at a time"""
+    try:
+        return ORJSONResponse(await get_user_analyses(str(current_user["_id"]), limit, cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def get_owned_analysis(analysis_id: str, current_user: dict) -> dict:
+    analysis = await get_analysis(analysis_id)
+    
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    # Check if the analysis belongs to the current user
+    if analysis["user_id"] != str(current_user["_id"]):
+        raise HTTPException(status_code=403, detail="Not authorized to access this analysis")
+    
+    return analysis
 
-def analyze_resume_format(text: str) -> Dict:
+@app.get("/user/analyses/{analysis_id}")
+async def get_analysis_detail(
+    analysis_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the full analysis document"""
+    return ORJSONResponse(await get_owned_analysis(analysis_id, current_user))
+
+def analyze_resume_format(document: Union[str, ResumeDocument]) -> Dict:
     # Basic format analysis
-    sections = {
-        "has_contact": bool(re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)),  # Email
-        "has_phone": bool(re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text)),  # Phone
-        "has_education": any(word in text.lower() for word in ["education", "university", "college", "degree"]),
-        "has_experience": any(word in text.lower() for word in ["experience", "work", "employment"]),
-        "has_skills": any(word in text.lower() for word in ["skills", "technologies", "tools"]),
-    }
+    if not isinstance(document, ResumeDocument):
+        document = ResumeDocument(document)
+    sections = document.format_sections()
     
     format_score = sum(sections.values()) * 20  # Each section worth 20 points
     return {
         "sections": sections,
-        "format_score": format_score
+        "format_score": format_score,
+        "headings": document.headings
     }
 
-def calculate_ats_score(text: str, extracted_skills: List[str], job_title: str = None) -> Dict:
+def calculate_ats_score(text: Union[str, ResumeDocument], extracted_skills: List[str], job_title: str = None,
+                        format_analysis: Dict = None, catalog: CatalogSnapshot = None) -> Dict:
     # Format analysis
-    format_analysis = analyze_resume_format(text)
+    if format_analysis is None:
+        format_analysis = analyze_resume_format(text)
     
     # Skills analysis
     skills_score = len(extracted_skills) * 5  # 5 points per skill
     skills_score = min(skills_score, 100)  # Cap at 100
     
     # Job match analysis if job title provided
+    catalog = catalog or CATALOG.current()
+    required_skills = catalog.job_skills.get(job_title, []) if job_title else []
     job_match_score = 0
-    if job_title and job_title in JOB_SKILLS:
-        required_skills = JOB_SKILLS[job_title]
-        matching_skills = [skill for skill in required_skills if skill in extracted_skills]
-        job_match_score = (len(matching_skills) / len(required_skills)) * 100
+    if required_skills:
+        matching_skills = catalog.job_skill_sets[job_title].intersection(extracted_skills)
+        job_match_score = (len(matching_skills) / len(catalog.job_skill_sets[job_title])) * 100
     
     # Calculate final ATS score
     ats_score = (format_analysis["format_score"] * 0.4 + skills_score * 0.3 + 
@@ -183,11 +302,12 @@ def calculate_ats_score(text: str, extracted_skills: List[str], job_title: str =
         "skills_score": skills_score,
         "job_match_score": round(job_match_score, 1) if job_title else None,
         "format_analysis": format_analysis["sections"],
+        "section_headings": format_analysis.get("headings", []),
         "improvement_suggestions": generate_improvement_suggestions(
             format_analysis["sections"],
             extracted_skills,
             job_title,
-            JOB_SKILLS.get(job_title, []) if job_title else []
+            required_skills
         )
     }
 
@@ -209,7 +329,8 @@ def generate_improvement_suggestions(format_analysis: Dict,
     
     # Skills-based suggestions
     if job_title and required_skills:
-        missing_skills = [skill for skill in required_skills if skill not in extracted_skills]
+        extracted_set = set(extracted_skills)
+        missing_skills = [skill for skill in required_skills if skill not in extracted_set]
         if missing_skills:
             suggestions.append(f"Consider acquiring these skills for {job_title}: {', '.join(missing_skills)}")
     
@@ -224,36 +345,107 @@ def generate_improvement_suggestions(format_analysis: Dict,
     return suggestions
 
 def categorize_skills(skills):
-    categorized = {}
-    for category, data in SKILL_CATEGORIES.items():
-        matching_skills = [skill for skill in skills if skill in data["skills"]]
-        if matching_skills:
-            categorized[category] = {
-                "icon": data["icon"],
-                "skills": matching_skills
+    catalog = CATALOG.current()
+    matching_skills = {}
+    for skill in skills:
+        for category in catalog.categories_by_skill.get(normalize_name(skill), ()):
+            matching_skills.setdefault(category, []).append(skill)
+
+    return {
+        category: {
+            "icon": data["icon"],
+            "skills": matching_skills[category]
+        }
+        for category, data in catalog.skill_categories.items()
+        if category in matching_skills
+    }
+
+async def parse_resume(upload: CheckedUpload) -> Dict:
+    """Extract the text, skills and format analysis of a resume, reusing cached results."""
+    content_hash = upload.sha256
+
+    catalog = CATALOG.current()
+
+    parsed = RESUME_CACHE.get(content_hash)
+    if parsed is None and RESUME_CACHE_PERSIST:
+        parsed = await get_cached_resume(content_hash)
+        if parsed is not None:
+            resume_cache_stats["persistent_hits"] += 1
+            RESUME_CACHE.set(content_hash, parsed)
+    if parsed is not None:
+        if parsed.get("catalog_version") != catalog.version:
+            # The catalog was reloaded since; only the skills need matching again
+            parsed = {
+                **parsed,
+                "skills": ResumeDocument(parsed["text"]).find_skills(catalog.matcher),
+                "catalog_version": catalog.version
             }
-    return categorized
+            RESUME_CACHE.set(content_hash, parsed)
+        return parsed
+
+    try:
+        text = await extract_text_async(upload.read())
+    except PDFExtractionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Normalize once; skills and format analysis read from the same document
+    document = ResumeDocument(text)
+    parsed = {
+        "text": document.normalized,
+        "skills": document.find_skills(catalog.matcher),
+        "format_analysis": analyze_resume_format(document),
+        "catalog_version": catalog.version
+    }
+    RESUME_CACHE.set(content_hash, parsed)
+    if RESUME_CACHE_PERSIST:
+        await save_cached_resume(content_hash, parsed)
+    return parsed
+
+async def parse_upload(file: UploadFile) -> Dict:
+    """Check an uploaded resume is a PDF and parse it"""
+    try:
+        upload = await receive_pdf(file)
+    except NotAPDF as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except IncompletePDF as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return await parse_resume(upload)
+
+@app.get("/cache/stats")
+async def get_cache_stats(current_user: dict = Depends(get_current_user)):
+    return {
+        "resume_cache": {**RESUME_CACHE.stats(), **resume_cache_stats},
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "chat_cache": get_chat_stats(),
+        "catalog": CATALOG.stats()
+    }
+
+def prerender_report(filename: str, analysis_data: dict):
+    """Render an analysis report into the report store ahead of its first download."""
+    REPORT_STORE.get_or_render(
+        report_key(filename, analysis_data), create_pdf_report, filename, analysis_data
+    )
+
+async def store_analysis(user_id: str, filename: str, analysis_data: dict, background_tasks: BackgroundTasks):
+    """Save an analysis and pre-render its report once the response has been sent."""
+    result = await save_resume_analysis(user_id, filename, analysis_data)
+    background_tasks.add_task(prerender_report, filename, analysis_data)
+    return result
 
 @app.post("/upload")
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
-    contents = await file.read()
-    
-    with open("temp.pdf", "wb") as f:
-        f.write(contents)
-
-    text = ""
-    with pdfplumber.open("temp.pdf") as pdf:
-        for page in pdf.pages:
-            text += page.extract_text()
-
-    # Extract skills
-    extracted_skills = [skill for skill in SKILLS if skill.lower() in text.lower()]
+    parsed = await parse_upload(file)
+    text = parsed["text"]
+    extracted_skills = parsed["skills"]
     
     # Calculate ATS score
-    ats_analysis = calculate_ats_score(text, extracted_skills)
+    ats_analysis = calculate_ats_score(text, extracted_skills, format_analysis=parsed["format_analysis"])
     
     # Save analysis to database
     analysis_data = {
@@ -262,107 +454,170 @@ async def upload_resume(
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    save_resume_analysis(
+    await store_analysis(
         str(current_user["_id"]),
         file.filename,
-        analysis_data
+        analysis_data,
+        background_tasks
     )
     
-    return {
+    return ORJSONResponse({
         "skills": extracted_skills,
         "ats_analysis": ats_analysis
-    }
+    })
+
+def catalog_response(request: Request, catalog: CatalogSnapshot, name: str, build) -> Response:
+    """Serve a catalog payload, building and serializing it only once per catalog version"""
+    key = (catalog.version, name)
+    prepared = CATALOG_RESPONSES.get(key)
+    if prepared is None:
+        prepared = PreparedResponse(build(catalog))
+        CATALOG_RESPONSES.set(key, prepared)
+    return prepared_response(request, prepared, f"public, max-age={CATALOG_RESPONSE_MAX_AGE_SECONDS}")
 
 @app.get("/jobs")
-async def get_jobs():
-    return {"jobs": list(JOB_SKILLS.keys())}
+async def get_jobs(request: Request):
+    return catalog_response(
+        request, CATALOG.current(), "jobs",
+        lambda catalog: {"jobs": list(catalog.job_skills.keys())}
+    )
+
+def compare_with_job(text: str, extracted_skills: List[str], job_title: str, format_analysis: Dict = None,
+                     catalog: CatalogSnapshot = None) -> Dict:
+    """Compare a resume's skills against the skills required for a job title."""
+    catalog = catalog or CATALOG.current()
+    # Get required skills for the job
+    required_skills = catalog.job_skills[job_title]
+    
+    # Calculate matching and missing skills
+    extracted_set = set(extracted_skills)
+    matching_skills = [skill for skill in required_skills if skill in extracted_set]
+    missing_skills = [skill for skill in required_skills if skill not in extracted_set]
+    
+    # Calculate match percentage
+    match_percentage = len(matching_skills) / len(required_skills) * 100 if required_skills else 0
+    
+    return {
+        "required_skills": required_skills,
+        "matching_skills": matching_skills,
+        "missing_skills": missing_skills,
+        "match_percentage": round(match_percentage, 1),
+        "ats_analysis": calculate_ats_score(text, extracted_skills, job_title, format_analysis, catalog)
+    }
 
 @app.post("/compare")
 async def compare_skills(
     job_title: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
-    if job_title not in JOB_SKILLS:
+    catalog = CATALOG.current()
+    if job_title not in catalog.job_skills:
         return {"error": "Job title not found"}
         
-    contents = await file.read()
+    parsed = await parse_upload(file)
+    extracted_skills = parsed["skills"]
     
-    with open("temp.pdf", "wb") as f:
-        f.write(contents)
-
-    text = ""
-    with pdfplumber.open("temp.pdf") as pdf:
-        for page in pdf.pages:
-            text += page.extract_text()
+    comparison = compare_with_job(parsed["text"], extracted_skills, job_title, parsed["format_analysis"], catalog)
+    
+    # Save analysis to database
+    analysis_data = {
+        "job_title": job_title,
+        "extracted_skills": extracted_skills,
+        **comparison,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    await store_analysis(
+        str(current_user["_id"]),
+        file.filename,
+        analysis_data,
+        background_tasks
+    )
+    
+    return ORJSONResponse({
+        "extracted_skills": extracted_skills,
+        **comparison
+    })
 
-    # Extract skills
-    extracted_skills = [skill for skill in SKILLS if skill.lower() in text.lower()]
+@app.post("/compare/batch")
+async def compare_skills_batch(
+    background_tasks: BackgroundTasks,
+    job_titles: List[str] = Query(...),
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """Compare one resume against several job titles, or "all" of them, in a single upload"""
+    catalog = CATALOG.current()
+    if job_titles == ["all"]:
+        job_titles = list(catalog.job_skills.keys())
     
-    # Get required skills for the job
-    required_skills = JOB_SKILLS[job_title]
+    unknown_titles = [title for title in job_titles if title not in catalog.job_skills]
+    if unknown_titles:
+        raise HTTPException(status_code=404, detail=f"Job title not found: {', '.join(unknown_titles)}")
     
-    # Calculate matching and missing skills
-    matching_skills = [skill for skill in required_skills if skill in extracted_skills]
-    missing_skills = [skill for skill in required_skills if skill not in extracted_skills]
+    parsed = await parse_upload(file)
+    extracted_skills = parsed["skills"]
     
-    # Calculate match percentage
-    match_percentage = len(matching_skills) / len(required_skills) * 100 if required_skills else 0
+    comparisons = {
+        job_title: compare_with_job(parsed["text"], extracted_skills, job_title, parsed["format_analysis"], catalog)
+        for job_title in dict.fromkeys(job_titles)
+    }
     
-    # Calculate ATS score
-    ats_analysis = calculate_ats_score(text, extracted_skills, job_title)
+    # Summarize by the best match, so listings and reports show its scores
+    best_title = max(comparisons, key=lambda title: comparisons[title]["match_percentage"])
+    average_match = sum(comparison["match_percentage"] for comparison in comparisons.values()) / len(comparisons)
     
-    # Save analysis to database
+    # Save one combined analysis to database
     analysis_data = {
-        "job_title": job_title,
+        "job_titles": list(comparisons.keys()),
+        "job_title": best_title,
+        "match_percentage": comparisons[best_title]["match_percentage"],
+        "average_match_percentage": round(average_match, 1),
+        "ats_analysis": comparisons[best_title]["ats_analysis"],
         "extracted_skills": extracted_skills,
-        "required_skills": required_skills,
-        "matching_skills": matching_skills,
-        "missing_skills": missing_skills,
-        "match_percentage": round(match_percentage, 1),
-        "ats_analysis": ats_analysis,
+        "comparisons": comparisons,
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    save_resume_analysis(
+    await store_analysis(
         str(current_user["_id"]),
         file.filename,
-        analysis_data
+        analysis_data,
+        background_tasks
     )
     
-    return {
+    return ORJSONResponse({
         "extracted_skills": extracted_skills,
-        "required_skills": required_skills,
-        "matching_skills": matching_skills,
-        "missing_skills": missing_skills,
-        "match_percentage": round(match_percentage, 1),
-        "ats_analysis": ats_analysis
-    }
+        "comparisons": comparisons
+    })
 
 @app.get("/download-report/{analysis_id}")
 async def download_report(
     analysis_id: str,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     # Get the analysis data
-    analysis = analyses.find_one({"_id": ObjectId(analysis_id)})
-    
-    if not analysis:
-        raise HTTPException(status_code=404, detail="Analysis not found")
-    
-    # Check if the analysis belongs to the current user
-    if str(analysis["user_id"]) != str(current_user["_id"]):
-        raise HTTPException(status_code=403, detail="Not authorized to access this report")
+    analysis = await get_owned_analysis(analysis_id, current_user)
+    key = report_key(analysis["filename"], analysis["analysis_data"])
     
     try:
-        # Generate the PDF report
-        pdf_path = create_pdf_report(analysis["filename"], analysis["analysis_data"])
+        # Serve the pre-rendered report, rendering it now if it is missing
+        pdf_path = REPORT_STORE.get(key)
+        if pdf_path is None:
+            pdf_path = await run_in_threadpool(
+                REPORT_STORE.get_or_render, key, create_pdf_report, analysis["filename"], analysis["analysis_data"]
+            )
         
-        # Return the PDF file
-        return FileResponse(
+        return ranged_file_response(
+            request,
             pdf_path,
             media_type="application/pdf",
-            filename=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            etag=f'"{key}"',
+            filename=f"resume_analysis_{analysis_id}.pdf",
+            headers={"Cache-Control": "private, max-age=86400"}
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -373,76 +628,126 @@ async def generate_resume_endpoint(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        # Generate the resume
-        pdf_path = generate_resume(data.jobRole, data.resumeData)
+        # Generate the resume on the worker pool
+        pdf_bytes = await generate_resume_async(data.jobRole, data.resumeData)
         
-        # Return the PDF file
-        return FileResponse(
-            pdf_path,
+        # Stream the PDF bytes
+        return StreamingResponse(
+            iter_bytes(pdf_bytes),
             media_type="application/pdf",
-            filename=f"resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            headers={
+                "Content-Disposition": f'attachment; filename="resume_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"',
+                "Content-Length": str(len(pdf_bytes))
+            }
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def target_skills_for_role(role: str) -> Optional[List[str]]:
+    """Skills a resume should highlight for a job title or an industry sub-category"""
+    catalog = CATALOG.current()
+    if role in catalog.job_skills:
+        return catalog.job_skills[role]
+    profile = catalog.profiles_by_name.get(role)
+    if profile:
+        return list(profile.required_skills + profile.recommended_skills)
+    return None
+
+@app.post("/generate-resume/batch")
+async def generate_resume_batch_endpoint(
+    data: BatchResumeData,
+    current_user: dict = Depends(get_current_user)
+):
+    """Generate one tailored resume per role and stream them back as a ZIP archive"""
+    roles = list(dict.fromkeys(data.roles))
+    if not roles:
+        raise HTTPException(status_code=400, detail="At least one role is required")
+    
+    resumes = {}
+    for role in roles:
+        target_skills = target_skills_for_role(role)
+        if target_skills is None:
+            raise HTTPException(status_code=404, detail=f"Role not found: {role}")
+        filename = f"resume_{re.sub(r'[^a-z0-9]+', '_', role.lower()).strip('_')}.pdf"
+        resumes[filename] = (role, tailor_resume_data(data.resumeData, target_skills))
+    
+    return StreamingResponse(
+        generate_resumes_zip(resumes),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="resumes_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip"'}
+    )
+
 @app.get("/api/industries")
-async def get_industries():
+async def get_industries(request: Request):
     """Get all available industries"""
-    return {
-        "industries": [
-            {
-                "name": industry,
-                "icon": data["icon"],
-                "description": data["description"]
-            }
-            for industry, data in industries_data.items()
-        ]
-    }
+    return catalog_response(
+        request, CATALOG.current(), "industries",
+        lambda catalog: {
+            "industries": [
+                {
+                    "name": industry,
+                    "icon": data["icon"],
+                    "description": data["description"]
+                }
+                for industry, data in catalog.industries.items()
+            ]
+        }
+    )
 
 @app.get("/api/industries/{industry}/job-profiles")
-async def get_job_profiles(industry: str):
+async def get_job_profiles(industry: str, request: Request):
     """Get all job profiles for a specific industry"""
-    if industry not in industries_data:
+    catalog = CATALOG.current()
+    if industry not in catalog.industries:
         raise HTTPException(status_code=404, detail="Industry not found")
     
-    return {
-        "job_profiles": [
-            {
-                "category": category,
-                "sub_categories": [
-                    {
-                        "name": sub["name"],
-                        "required_skills": sub["required_skills"],
-                        "recommended_skills": sub["recommended_skills"]
-                    }
-                    for sub in profiles["sub_categories"]
-                ]
-            }
-            for category, profiles in industries_data[industry]["job_profiles"].items()
-        ]
-    }
+    return catalog_response(
+        request, catalog, f"job-profiles:{industry}",
+        lambda catalog: {
+            "job_profiles": [
+                {
+                    "category": category,
+                    "sub_categories": [
+                        {
+                            "name": sub["name"],
+                            "required_skills": sub["required_skills"],
+                            "recommended_skills": sub["recommended_skills"]
+                        }
+                        for sub in profiles["sub_categories"]
+                    ]
+                }
+                for category, profiles in catalog.industries[industry]["job_profiles"].items()
+            ]
+        }
+    )
+
+def skill_keyword_category(skill: str, catalog: CatalogSnapshot = None) -> str:
+    """Look up the keyword category of a lowercase skill, computing it for skills outside the catalog"""
+    category = (catalog or CATALOG.current()).keyword_categories.get(skill)
+    return category if category is not None else keyword_category(skill)
 
-def calculate_skill_match_score(user_skills: List[str], required_skills: List[str], recommended_skills: List[str]) -> Dict:
-    """Calculate a weighted skill match score with detailed analysis"""
+def score_skill_match(user_skills: List[str], required_skills_set: FrozenSet[str], recommended_skills_set: FrozenSet[str],
+                      catalog: CatalogSnapshot = None) -> Dict:
+    """Score user skills against already-normalized (lowercase) required and recommended skill sets"""
+    catalog = catalog or CATALOG.current()
     user_skills_set = set(skill.lower() for skill in user_skills)
-    required_skills_set = set(skill.lower() for skill in required_skills)
-    recommended_skills_set = set(skill.lower() for skill in recommended_skills)
     
     # Calculate exact matches
     matching_required = required_skills_set & user_skills_set
     matching_recommended = recommended_skills_set & user_skills_set
     
     # Calculate partial matches (skills that contain or are contained by user skills)
-    partial_matches_required = set()
-    partial_matches_recommended = set()
+    related_skills = catalog.containment.related_to_any(user_skills_set)
+    partial_matches_required = set(required_skills_set & related_skills)
+    partial_matches_recommended = set(recommended_skills_set & related_skills)
     
-    for user_skill in user_skills_set:
-        for req_skill in required_skills_set:
-            if user_skill in req_skill or req_skill in user_skill:
-                partial_matches_required.add(req_skill)
-        for rec_skill in recommended_skills_set:
-            if user_skill in rec_skill or rec_skill in user_skill:
-                partial_matches_recommended.add(rec_skill)
+    # Skills outside the catalog are not indexed and are compared directly
+    for skill in (required_skills_set | recommended_skills_set) - catalog.containment.skills:
+        if any(user_skill in skill or skill in user_skill for user_skill in user_skills_set):
+            if skill in required_skills_set:
+                partial_matches_required.add(skill)
+            if skill in recommended_skills_set:
+                partial_matches_recommended.add(skill)
     
     # Calculate scores
     required_exact_score = len(matching_required) / len(required_skills_set) * 100
@@ -468,14 +773,7 @@ def calculate_skill_match_score(user_skills: List[str], required_skills: List[st
     }
     
     for skill in user_skills:
-        if any(tech in skill.lower() for tech in ["programming", "code", "software", "development", "engineering"]):
-            skill_categories["Technical"].append(skill)
-        elif any(soft in skill.lower() for soft in ["communication", "leadership", "management", "team", "problem"]):
-            skill_categories["Soft Skills"].append(skill)
-        elif any(tool in skill.lower() for tool in ["tool", "software", "platform", "system"]):
-            skill_categories["Tools"].append(skill)
-        else:
-            skill_categories["Domain Knowledge"].append(skill)
+        skill_categories[skill_keyword_category(skill.lower(), catalog)].append(skill)
     
     return {
         "overall_score": round(overall_score, 2),
@@ -547,27 +845,22 @@ async def analyze_job_fit(
     token: str = Depends(verify_token)
 ):
     """Analyze how well a user's skills match a specific job profile"""
-    if industry not in industries_data:
+    catalog = CATALOG.current()
+    if industry not in catalog.industries:
         raise HTTPException(status_code=404, detail="Industry not found")
     
     # Find the job profile and sub-category
-    job_data = None
-    for category in industries_data[industry]["job_profiles"].values():
-        for sub in category["sub_categories"]:
-            if sub["name"] == sub_category:
-                job_data = sub
-                break
-        if job_data:
-            break
+    job_data = catalog.profiles.get((industry, sub_category))
     
     if not job_data:
         raise HTTPException(status_code=404, detail="Job profile not found")
     
     # Calculate detailed skill match analysis
-    skill_analysis = calculate_skill_match_score(
+    skill_analysis = score_skill_match(
         skills,
-        job_data["required_skills"],
-        job_data["recommended_skills"]
+        job_data.required_set,
+        job_data.recommended_set,
+        catalog
     )
     
     return {
@@ -577,6 +870,44 @@ async def analyze_job_fit(
         "match_analysis": skill_analysis
     }
 
+@app.post("/api/resume/rank-job-profiles")
+async def rank_job_profiles(
+    skills: List[str],
+    top_k: int = Query(5, ge=1, le=50),
+    current_user: dict = Depends(get_current_user)
+):
+    """Rank every job profile across all industries by how well the user's skills fit"""
+    return {"rankings": CATALOG.current().profile_matrix.top_k(skills, top_k)}
+
+def build_job_specific_resume_data(
+    industry: str,
+    sub_category: str,
+    skills: List[str],
+    experience: List[Dict],
+    education: List[Dict]
+) -> dict:
+    """Build resume data focused on the skills of a job profile"""
+    catalog = CATALOG.current()
+    if industry not in catalog.industries:
+        raise HTTPException(status_code=404, detail="Industry not found")
+    
+    # Find the job profile and sub-category
+    job_data = catalog.profiles.get((industry, sub_category))
+    
+    if not job_data:
+        raise HTTPException(status_code=404, detail="Job profile not found")
+    
+    return tailor_resume_data(
+        {
+            "personalInfo": {"fullName": "", "email": "", "phone": "", "linkedin": "", "summary": ""},
+            "skills": {"technical": skills, "soft": []},
+            "experience": experience,
+            "education": education,
+            "projects": []
+        },
+        list(job_data.required_skills + job_data.recommended_skills)
+    )
+
 @app.post("/api/resume/generate-job-specific")
 async def generate_job_specific_resume(
     job_profile: str,
@@ -588,41 +919,165 @@ async def generate_job_specific_resume(
     token: str = Depends(verify_token)
 ):
     """Generate a job-specific resume based on the target role"""
-    if industry not in industries_data:
-        raise HTTPException(status_code=404, detail="Industry not found")
+    resume_data = build_job_specific_resume_data(industry, sub_category, skills, experience, education)
+    pdf_bytes = await generate_resume_async(job_profile, resume_data)
     
-    # Find the job profile and sub-category
-    job_data = None
-    for category in industries_data[industry]["job_profiles"].values():
-        for sub in category["sub_categories"]:
-            if sub["name"] == sub_category:
-                job_data = sub
-                break
-        if job_data:
-            break
-    
-    if not job_data:
-        raise HTTPException(status_code=404, detail="Job profile not found")
-    
-    # Generate resume with job-specific focus
-    resume_content = generate_resume(
-        skills=skills,
-        experience=experience,
-        education=education,
-        target_role=job_profile,
-        target_skills=job_data["required_skills"] + job_data["recommended_skills"]
+    return StreamingResponse(
+        iter_bytes(pdf_bytes),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="resume_{job_profile.lower().replace(" ", "_")}.pdf"',
+            "Content-Length": str(len(pdf_bytes))
+        }
     )
+
+async def submit_render_job(kind: str, current_user: dict, filename: str, func, *args) -> dict:
+    """Queue a PDF render for the current user, rejecting it when the queue is full"""
+    try:
+        job = await RENDER_JOBS.submit(kind, str(current_user["_id"]), "application/pdf", filename, func, *args)
+    except JobQueueFull:
+        raise server_busy()
+    return job.to_dict()
+
+def get_owned_job(job_id: str, current_user: dict):
+    job = RENDER_JOBS.get(job_id)
+    if job is None or job.owner != str(current_user["_id"]):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/render-jobs/resume", status_code=202)
+async def submit_resume_job(
+    data: ResumeData,
+    current_user: dict = Depends(get_current_user)
+):
+    """Queue a resume render; poll /render-jobs/{job_id} for its status"""
+    return await submit_render_job(
+        "resume", current_user, f"resume_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+        generate_resume, data.jobRole, data.resumeData
+    )
+
+@app.post("/render-jobs/report/{analysis_id}", status_code=202)
+async def submit_report_job(
+    analysis_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Queue an analysis report render"""
+    analysis = await get_owned_analysis(analysis_id, current_user)
+    return await submit_render_job(
+        "report", current_user, f"resume_analysis_{analysis_id}.pdf",
+        create_pdf_report, analysis["filename"], analysis["analysis_data"]
+    )
+
+@app.post("/render-jobs/job-specific", status_code=202)
+async def submit_job_specific_resume_job(
+    job_profile: str,
+    sub_category: str,
+    industry: str,
+    skills: List[str],
+    experience: List[Dict],
+    education: List[Dict],
+    current_user: dict = Depends(get_current_user)
+):
+    """Queue a job-specific resume render"""
+    resume_data = build_job_specific_resume_data(industry, sub_category, skills, experience, education)
+    return await submit_render_job(
+        "job-specific", current_user, f"resume_{job_profile.lower().replace(' ', '_')}.pdf",
+        generate_resume, job_profile, resume_data
+    )
+
+@app.get("/render-jobs/{job_id}")
+async def get_render_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get a render job's status, optionally waiting up to `wait` seconds for it to finish"""
+    job = get_owned_job(job_id, current_user)
+    if wait:
+        job = await RENDER_JOBS.wait(job, wait)
+    return job.to_dict()
+
+@app.get("/render-jobs/{job_id}/result")
+async def get_render_job_result(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Download the PDF of a finished render job"""
+    job = get_owned_job(job_id, current_user)
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
     
-    # Create PDF report
-    report_path = create_pdf_report(
-        resume_content,
-        f"resume_{job_profile.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return StreamingResponse(
+        iter_bytes(job.result),
+        media_type=job.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{job.filename}"',
+            "Content-Length": str(len(job.result))
+        }
     )
+
+@app.get("/render-jobs")
+async def get_render_job_stats(current_user: dict = Depends(get_current_user)):
+    return RENDER_JOBS.stats()
+
+def sse_event(data: dict, event: str = None) -> str:
+    """Format one Server-Sent Event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+@app.post("/chat")
+async def chat(
+    chat_message: ChatMessage,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Answer a chat message. Clients sending `Accept: text/event-stream` receive
+    the answer token by token as Server-Sent Events; others get it as JSON.
+    """
+    tokens = stream_chatbot_response(chat_message.message, chat_message.context)
     
-    return FileResponse(
-        report_path,
-        media_type="application/pdf",
-        filename=os.path.basename(report_path)
+    # Wait for the first token so capacity and backend errors still map to status codes
+    try:
+        first_token = await tokens.__anext__()
+    except StopAsyncIteration:
+        first_token = ""
+    except ChatBusy:
+        raise server_busy()
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="The assistant took too long to respond")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"The assistant is unavailable: {e}")
+    
+    if "text/event-stream" not in request.headers.get("accept", ""):
+        try:
+            answer = first_token + "".join([token async for token in tokens])
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="The assistant took too long to respond")
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"The assistant is unavailable: {e}")
+        return {"response": answer}
+    
+    async def events():
+        try:
+            if first_token:
+                yield sse_event({"token": first_token})
+            async for token in tokens:
+                yield sse_event({"token": token})
+            yield sse_event({}, event="done")
+        except asyncio.TimeoutError:
+            yield sse_event({"detail": "The assistant took too long to respond"}, event="error")
+        except Exception as e:
+            yield sse_event({"detail": f"The assistant is unavailable: {e}"}, event="error")
+        finally:
+            await tokens.aclose()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 # Mount frontend static files only in production
@@ -4,29 +4,43 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from datetime import datetime
+from io import BytesIO
 
-def create_pdf_report(filename: str, analysis_data: dict) -> str:
-    # Create a unique filename for the PDF
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    pdf_filename = f"reports/resume_analysis_{timestamp}.pdf"
+# Styles are built once and shared by every report
+styles = getSampleStyleSheet()
+
+title_style = ParagraphStyle(
+    'CustomTitle',
+    parent=styles['Heading1'],
+    fontSize=24,
+    spaceAfter=30
+)
+heading_style = ParagraphStyle(
+    'CustomHeading',
+    parent=styles['Heading2'],
+    fontSize=14,
+    spaceAfter=12
+)
+table_style = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+def create_pdf_report(filename: str, analysis_data: dict) -> bytes:
+    """Render the analysis report and return the PDF bytes."""
+    buffer = BytesIO()
     
     # Create the document
-    doc = SimpleDocTemplate(pdf_filename, pagesize=letter)
-    styles = getSampleStyleSheet()
-    
-    # Create custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12
-    )
+    doc = SimpleDocTemplate(buffer, pagesize=letter, title=f"Resume Analysis - {filename}")
     
     # Build the document content
     content = []
@@ -53,19 +67,7 @@ def create_pdf_report(filename: str, analysis_data: dict) -> str:
             scores_data.append(["Job Match Score", f"{ats['job_match_score']}%"])
         
         scores_table = Table(scores_data, colWidths=[3*inch, 2*inch])
-        scores_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        scores_table.setStyle(table_style)
         content.append(scores_table)
         content.append(Spacer(1, 20))
         
@@ -76,19 +78,7 @@ def create_pdf_report(filename: str, analysis_data: dict) -> str:
             format_data.append([section.replace("has_", "").title(), "✓" if present else "✗"])
         
         format_table = Table(format_data, colWidths=[3*inch, 2*inch])
-        format_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        format_table.setStyle(table_style)
         content.append(format_table)
         content.append(Spacer(1, 20))
     
@@ -100,7 +90,33 @@ def create_pdf_report(filename: str, analysis_data: dict) -> str:
         content.append(Spacer(1, 20))
     
     # Job Match Analysis
-    if "job_title" in analysis_data:
+    if "comparisons" in analysis_data:
+        content.append(Paragraph("Job Match Analysis", heading_style))
+        # Batch analyses saved before the summary was added only have the comparisons
+        if "job_title" in analysis_data:
+            content.append(Paragraph(
+                f"Best Match: {analysis_data['job_title']} ({analysis_data['match_percentage']}%)", styles["Normal"]
+            ))
+            content.append(Paragraph(f"Average Match: {analysis_data['average_match_percentage']}%", styles["Normal"]))
+            content.append(Spacer(1, 10))
+        
+        # One row per job title, best match first
+        comparisons_data = [["Job Title", "Match", "Matching Skills", "Missing Skills"]]
+        for job_title, comparison in sorted(
+            analysis_data["comparisons"].items(), key=lambda item: -item[1]["match_percentage"]
+        ):
+            comparisons_data.append([
+                job_title,
+                f"{comparison['match_percentage']}%",
+                str(len(comparison["matching_skills"])),
+                str(len(comparison["missing_skills"]))
+            ])
+        
+        comparisons_table = Table(comparisons_data, colWidths=[2.5*inch, 1*inch, 1.5*inch, 1.5*inch])
+        comparisons_table.setStyle(table_style)
+        content.append(comparisons_table)
+        content.append(Spacer(1, 20))
+    elif "job_title" in analysis_data:
         content.append(Paragraph("Job Match Analysis", heading_style))
         content.append(Paragraph(f"Job Title: {analysis_data['job_title']}", styles["Normal"]))
         content.append(Spacer(1, 10))
@@ -123,4 +139,4 @@ def create_pdf_report(filename: str, analysis_data: dict) -> str:
     
     # Build the PDF
     doc.build(content)
-    return pdf_filename 
\ No newline at end of file
+    return buffer.getvalue() 
\ No newline at end of file
@@ -0,0 +1,170 @@
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Tuple
+
+import numpy as np
+
+from cache import LRUCache
+
+class JobProfile(NamedTuple):
+    """A sub-category of an industry job profile with its skills pre-normalized."""
+    industry: str
+    category: str
+    name: str
+    required_skills: Tuple[str, ...]
+    recommended_skills: Tuple[str, ...]
+    required_set: FrozenSet[str]
+    recommended_set: FrozenSet[str]
+
+def build_profile_index(industries_data: Dict) -> Mapping[Tuple[str, str], JobProfile]:
+    """
+    Build a read-only index of every job profile keyed by (industry, sub_category).
+    The first sub-category with a given name wins, as with the previous linear scan.
+    """
+    index = {}
+    for industry, data in industries_data.items():
+        for category, profiles in data["job_profiles"].items():
+            for sub in profiles["sub_categories"]:
+                key = (industry, sub["name"])
+                if key in index:
+                    continue
+                index[key] = JobProfile(
+                    industry=industry,
+                    category=category,
+                    name=sub["name"],
+                    required_skills=tuple(sub["required_skills"]),
+                    recommended_skills=tuple(sub["recommended_skills"]),
+                    required_set=frozenset(skill.lower() for skill in sub["required_skills"]),
+                    recommended_set=frozenset(skill.lower() for skill in sub["recommended_skills"])
+                )
+    return MappingProxyType(index)
+
+def index_profiles_by_name(profiles: Mapping[Tuple[str, str], JobProfile]) -> Mapping[str, JobProfile]:
+    """Index job profiles by sub-category name alone; the first industry listing a name wins."""
+    index = {}
+    for profile in profiles.values():
+        index.setdefault(profile.name, profile)
+    return MappingProxyType(index)
+
+class SkillContainmentIndex:
+    """
+    Substring-containment index over normalized catalog skills. related(skill)
+    returns the catalog skills that contain, or are contained in, a skill,
+    matching the `a in b or b in a` partial-match rule without scanning.
+    """
+
+    def __init__(self, skills: Iterable[str], cache_size: int = 4096):
+        self.skills = frozenset(skills)
+
+        containing: Dict[str, set] = {}
+        for skill in self.skills:
+            for start in range(len(skill)):
+                for end in range(start + 1, len(skill) + 1):
+                    containing.setdefault(skill[start:end], set()).add(skill)
+        self._containing = {substring: frozenset(found) for substring, found in containing.items()}
+
+        self._catalog_related = {skill: self._lookup(skill) for skill in self.skills}
+        self._related = LRUCache(maxsize=cache_size)
+
+    def _lookup(self, skill: str) -> FrozenSet[str]:
+        if not skill:
+            return self.skills
+        substrings = {
+            skill[start:end]
+            for start in range(len(skill))
+            for end in range(start + 1, len(skill) + 1)
+        }
+        return self._containing.get(skill, frozenset()) | (substrings & self.skills)
+
+    def related(self, skill: str) -> FrozenSet[str]:
+        """Catalog skills containing or contained in a lowercase skill."""
+        found = self._catalog_related.get(skill)
+        if found is None:
+            found = self._related.get(skill)
+            if found is None:
+                found = self._lookup(skill)
+                self._related.set(skill, found)
+        return found
+
+    def related_to_any(self, skills: Iterable[str]) -> FrozenSet[str]:
+        """Catalog skills related to at least one of the given lowercase skills."""
+        return frozenset().union(*[self.related(skill) for skill in skills])
+
+class ProfileMatrix:
+    """
+    Every job profile's required and recommended skills encoded as 0/1 rows over
+    a shared skill vocabulary, so a skill set is scored against all profiles with
+    two matrix-vector products. Scores follow main.score_skill_match: exact
+    matches count fully, partial (substring) matches half, weighted 0.7/0.3.
+    """
+
+    def __init__(self, profiles: Mapping[Tuple[str, str], JobProfile], containment: SkillContainmentIndex = None):
+        self.profiles = list(profiles.values())
+        vocabulary = sorted(set().union(*[p.required_set | p.recommended_set for p in self.profiles]))
+        self.vocabulary = {skill: column for column, skill in enumerate(vocabulary)}
+        self.containment = containment or SkillContainmentIndex(vocabulary)
+
+        self.required = np.zeros((len(self.profiles), len(vocabulary)))
+        self.recommended = np.zeros((len(self.profiles), len(vocabulary)))
+        for row, profile in enumerate(self.profiles):
+            self.required[row, [self.vocabulary[s] for s in profile.required_set]] = 1
+            self.recommended[row, [self.vocabulary[s] for s in profile.recommended_set]] = 1
+
+        self.required_counts = self.required.sum(axis=1)
+        self.recommended_counts = self.recommended.sum(axis=1)
+
+    def encode(self, user_skills: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode a skill set as exact and partial-only match vectors over the vocabulary."""
+        user_skills_set = set(skill.lower() for skill in user_skills)
+        exact = np.zeros(len(self.vocabulary))
+        partial = np.zeros(len(self.vocabulary))
+        for skill in self.containment.related_to_any(user_skills_set):
+            column = self.vocabulary.get(skill)
+            if column is not None:
+                partial[column] = 1
+        for skill in user_skills_set:
+            column = self.vocabulary.get(skill)
+            if column is not None:
+                exact[column] = 1
+                partial[column] = 0
+        return exact, partial
+
+    def score(self, user_skills: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Score a skill set against every profile at once."""
+        exact, partial = self.encode(user_skills)
+        weighted = exact * 100 + partial * 50
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            required_score = np.where(
+                self.required_counts > 0, (self.required @ weighted) / self.required_counts, 0.0
+            )
+            recommended_score = np.where(
+                self.recommended_counts > 0, (self.recommended @ weighted) / self.recommended_counts, 0.0
+            )
+
+        return {
+            "overall": required_score * 0.7 + recommended_score * 0.3,
+            "required": required_score,
+            "recommended": recommended_score
+        }
+
+    def top_k(self, user_skills: Iterable[str], k: int = 5) -> List[Dict]:
+        """Return the k best-fitting profiles with their scores, best first."""
+        scores = self.score(user_skills)
+        overall = scores["overall"]
+        k = max(0, min(k, len(self.profiles)))
+        if k == 0:
+            return []
+
+        best = np.argpartition(-overall, k - 1)[:k]
+        best = best[np.argsort(-overall[best], kind="stable")]
+        return [
+            {
+                "industry": self.profiles[row].industry,
+                "category": self.profiles[row].category,
+                "sub_category": self.profiles[row].name,
+                "overall_score": round(float(overall[row]), 2),
+                "required_score": round(float(scores["required"][row]), 2),
+                "recommended_score": round(float(scores["recommended"][row]), 2)
+            }
+            for row in best
+        ]
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Dict, Optional
+
+# Render jobs running at once on the executor; the rest wait queued
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+# Jobs that may be queued or running at once before submissions are rejected
+RENDER_QUEUE_DEPTH = int(os.getenv("RENDER_QUEUE_DEPTH", "64"))
+# How long finished jobs and their results are kept for polling
+RENDER_RESULT_TTL_SECONDS = int(os.getenv("RENDER_RESULT_TTL_SECONDS", "600"))
+# Finished jobs kept at most, oldest dropped first, so stored results stay bounded in memory
+RENDER_MAX_FINISHED_JOBS = int(os.getenv("RENDER_MAX_FINISHED_JOBS", "256"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+class JobQueueFull(Exception):
+    """Raised when the render queue is at its depth limit."""
+
+class Job:
+    """A submitted render and, once finished, its result or error."""
+
+    def __init__(self, kind: str, owner: str, media_type: str, filename: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner = owner
+        self.media_type = media_type
+        self.filename = filename
+        self.status = QUEUED
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+class JobBackend(ABC):
+    """Interface of a render job backend."""
+
+    @abstractmethod
+    async def submit(self, kind: str, owner: str, media_type: str, filename: str,
+                     func: Callable[..., bytes], *args) -> Job:
+        """Queue a render of func(*args); raises JobQueueFull when the queue is at its limit."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """The job with this id, or None if it is unknown or expired."""
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Wait up to `timeout` seconds for a job to finish and return it."""
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Queue and job counters."""
+
+    def shutdown(self):
+        pass
+
+class LocalJobBackend(JobBackend):
+    """
+    In-process backend: renders run on an executor owned by the caller, e.g.
+    a shared process pool returned by `get_executor`, at most `workers` at a
+    time. Results are kept in memory, up to max_finished of them for
+    result_ttl seconds. Suitable for a single worker and for tests.
+    """
+
+    def __init__(self, get_executor: Callable[[], Executor], workers: int = RENDER_WORKERS,
+                 queue_depth: int = RENDER_QUEUE_DEPTH, result_ttl: int = RENDER_RESULT_TTL_SECONDS,
+                 max_finished: int = RENDER_MAX_FINISHED_JOBS):
+        self.get_executor = get_executor
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.result_ttl = result_ttl
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Job] = {}
+        # Finished jobs in the order they finished, oldest first
+        self._finished: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._active = 0
+        self.counters = {SUCCEEDED: 0, FAILED: 0, "rejected": 0}
+
+    def _purge(self):
+        now = time.time()
+        while self._finished:
+            job = next(iter(self._finished.values()))
+            if len(self._finished) <= self.max_finished and now - job.finished_at <= self.result_ttl:
+                break
+            del self._finished[job.id]
+            del self._jobs[job.id]
+
+    async def submit(self, kind: str, owner: str, media_type: str, filename: str,
+                     func: Callable[..., bytes], *args) -> Job:
+        self._purge()
+        if self._active >= self.queue_depth:
+            self.counters["rejected"] += 1
+            raise JobQueueFull()
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        job = Job(kind, owner, media_type, filename)
+        self._jobs[job.id] = job
+        self._active += 1
+        task = asyncio.ensure_future(self._run(job, func, args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, func: Callable[..., bytes], args: tuple):
+        loop = asyncio.get_running_loop()
+        try:
+            # Jobs stay queued until a worker slot is free
+            async with self._slots:
+                job.status = RUNNING
+                job.result = await loop.run_in_executor(self.get_executor(), func, *args)
+            job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.error = "Job was cancelled"
+            job.status = FAILED
+            raise
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._active -= 1
+            self.counters[job.status] += 1
+            self._finished[job.id] = job
+            self._purge()
+            job.done.set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "active": self._active,
+            "stored": len(self._jobs),
+            "finished": len(self._finished),
+            **self.counters
+        }
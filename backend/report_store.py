@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+# Bump when the report layout changes so stale renders are not served
+REPORT_VERSION = "1"
+
+def report_key(filename: str, analysis_data: dict) -> str:
+    """Content key of a report: a hash of everything the rendered PDF depends on."""
+    payload = json.dumps(
+        {"version": REPORT_VERSION, "filename": filename, "analysis_data": analysis_data},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ReportStore:
+    """
+    Directory of pre-rendered PDFs named by content key. Files older than
+    max_age_seconds are dropped, then the least recently used ones until the
+    directory fits in max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the path of a stored report, or None if it is missing or expired."""
+        path = self.path(key)
+        try:
+            modified = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() - modified > self.max_age_seconds:
+            return None
+        # Reads count as use for LRU eviction
+        os.utime(path)
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Atomically store a rendered report and evict old ones."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return self.path(key)
+
+    def get_or_render(self, key: str, render: Callable[..., bytes], *args) -> str:
+        """Return the stored report, rendering and storing it first if needed."""
+        path = self.get(key)
+        if path is None:
+            path = self.put(key, render(*args))
+        return path
+
+    def evict(self):
+        with self._lock:
+            now = time.time()
+            entries = []
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    self._remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,85 @@
+import re
+import unicodedata
+from typing import Dict, List
+
+# Words hyphenated across a line break, e.g. "experi-\nence"; a capital after the break is kept apart
+# (the pattern starts with the literal hyphen so the regex engine can skip ahead to it)
+_HYPHENATION = re.compile(r"-(?<=[^\W\d_]-)[ \t]*\r?\n[ \t]*(?=[^\W\d_A-Z])")
+# Soft hyphens and zero-width characters left behind by PDF text extraction
+_INVISIBLE = dict.fromkeys(map(ord, "\u00ad\u200b\u200c\u200d\u2060\ufeff"))
+
+# Section headings, matched as whole lines of the case-folded text
+SECTION_HEADINGS = {
+    "contact": ["contact", "contact information", "contact details", "personal information", "personal details"],
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "education": ["education", "academic background", "education and training", "qualifications"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history"
+    ],
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "technologies",
+        "tools", "skills and tools", "competencies", "core competencies"
+    ],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications"]
+}
+_HEADING_KINDS = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Keywords of the format analysis; they count anywhere in the text, as substrings
+SECTION_KEYWORDS = {
+    "education": ("education", "university", "college", "degree"),
+    "experience": ("experience", "work", "employment"),
+    "skills": ("skills", "technologies", "tools")
+}
+_EMAIL_PATTERN = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+_PHONE_PATTERN = re.compile(r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b")
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalize extracted text (which also splits ligatures such as "ﬁ") and rejoin hyphenated words."""
+    # Plain ASCII is already in NFKC form and has no invisible characters
+    if not text.isascii():
+        if not unicodedata.is_normalized("NFKC", text):
+            text = unicodedata.normalize("NFKC", text)
+        text = text.translate(_INVISIBLE)
+    return _HYPHENATION.sub("", text)
+
+class ResumeDocument:
+    """
+    A resume's text normalized and case-folded once, with its section
+    headings found in a single pass over the lines. Format scoring, skill
+    extraction and the ATS score all read from it instead of re-scanning
+    or re-lowercasing the text.
+    """
+
+    def __init__(self, text: str):
+        self.normalized = normalize_text(text)
+        self.folded = self.normalized.casefold()
+
+        self.has_email = _EMAIL_PATTERN.search(self.folded) is not None
+        self.has_phone = _PHONE_PATTERN.search(self.folded) is not None
+        self.has_education, self.has_experience, self.has_skills = (
+            any(keyword in self.folded for keyword in SECTION_KEYWORDS[section])
+            for section in ("education", "experience", "skills")
+        )
+
+        # Section kinds in the order their heading lines appear
+        self.headings: List[str] = [
+            heading
+            for heading in (_HEADING_KINDS.get(line.strip(" \t\r:")) for line in self.folded.split("\n"))
+            if heading is not None
+        ]
+
+    def format_sections(self) -> Dict[str, bool]:
+        """Presence of the sections the format score is based on."""
+        return {
+            "has_contact": self.has_email,
+            "has_phone": self.has_phone,
+            "has_education": self.has_education,
+            "has_experience": self.has_experience,
+            "has_skills": self.has_skills,
+        }
+
+    def find_skills(self, matcher) -> List[str]:
+        """Catalog skills mentioned anywhere in the resume."""
+        return matcher.find(self.folded)
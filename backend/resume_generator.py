@@ -3,43 +3,76 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import multiprocessing
 import os
+import zipfile
+
+# Worker processes rendering resumes outside the event loop
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "2"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Styles are built once and shared by every resume
+styles = getSampleStyleSheet()
+normal_style = styles['Normal']
+title_style = ParagraphStyle(
+    'CustomTitle',
+    parent=styles['Heading1'],
+    fontSize=16,
+    spaceAfter=30,
+    alignment=1  # Center alignment
+)
+heading_style = ParagraphStyle(
+    'CustomHeading',
+    parent=styles['Heading2'],
+    fontSize=14,
+    spaceBefore=12,
+    spaceAfter=6,
+    textColor=colors.HexColor('#2563eb')  # Blue color
+)
+contact_style = ParagraphStyle(
+    'ContactInfo',
+    parent=normal_style,
+    alignment=1,
+    spaceAfter=20
+)
+experience_header_style = ParagraphStyle('ExperienceHeader', parent=normal_style, spaceBefore=8)
+experience_dates_style = ParagraphStyle('ExperienceDates', parent=normal_style, textColor=colors.gray)
+bullet_style = ParagraphStyle(
+    'Bullet',
+    parent=normal_style,
+    leftIndent=20,
+    spaceBefore=6
+)
+education_header_style = ParagraphStyle('EducationHeader', parent=normal_style, spaceBefore=8)
+education_date_style = ParagraphStyle('EducationDate', parent=normal_style, textColor=colors.gray)
+project_header_style = ParagraphStyle('ProjectHeader', parent=normal_style, spaceBefore=8)
+project_description_style = ParagraphStyle(
+    'ProjectDescription',
+    parent=normal_style,
+    leftIndent=20,
+    spaceBefore=6
+)
+project_link_style = ParagraphStyle('ProjectLink', parent=normal_style, textColor=colors.blue)
+
+def generate_resume(job_role: str, resume_data: dict) -> bytes:
+    """Render a resume and return the PDF bytes."""
+    buffer = BytesIO()
 
-def generate_resume(job_role: str, resume_data: dict) -> str:
-    # Create a unique filename for the PDF
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"reports/resume_{resume_data['personalInfo']['fullName'].replace(' ', '_')}_{timestamp}.pdf"
-    
     # Create the document
-    doc = SimpleDocTemplate(filename, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-    
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=30,
-        alignment=1  # Center alignment
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceBefore=12,
-        spaceAfter=6,
-        textColor=colors.HexColor('#2563eb')  # Blue color
-    )
-    normal_style = styles['Normal']
-    
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+
     # Build content
     content = []
-    
+
     # Header/Contact Information
     personal_info = resume_data['personalInfo']
     content.append(Paragraph(personal_info['fullName'], title_style))
-    
+
     contact_info = []
     if personal_info['email']:
         contact_info.append(personal_info['email'])
@@ -49,77 +82,63 @@ def generate_resume(job_role: str, resume_data: dict) -> str:
         contact_info.append(f"LinkedIn: {personal_info['linkedin']}")
     if personal_info.get('github'):
         contact_info.append(f"GitHub: {personal_info['github']}")
-    
-    content.append(Paragraph(' | '.join(contact_info), ParagraphStyle(
-        'ContactInfo',
-        parent=styles['Normal'],
-        alignment=1,
-        spaceAfter=20
-    )))
-    
+
+    content.append(Paragraph(' | '.join(contact_info), contact_style))
+
     # Professional Summary
     if personal_info['summary']:
         content.append(Paragraph('Professional Summary', heading_style))
         content.append(Paragraph(personal_info['summary'], normal_style))
         content.append(Spacer(1, 12))
-    
+
     # Skills
     if resume_data['skills']['technical'] or resume_data['skills']['soft']:
         content.append(Paragraph('Skills', heading_style))
-        
+
         if resume_data['skills']['technical']:
             content.append(Paragraph(
                 f"<b>Technical Skills:</b> {', '.join(resume_data['skills']['technical'])}",
                 normal_style
             ))
-        
+
         if resume_data['skills']['soft']:
             content.append(Paragraph(
                 f"<b>Soft Skills:</b> {', '.join(resume_data['skills']['soft'])}",
                 normal_style
             ))
-        
+
         content.append(Spacer(1, 12))
-    
+
     # Experience
     if resume_data['experience']:
         content.append(Paragraph('Professional Experience', heading_style))
-        
+
         for exp in resume_data['experience']:
             # Company and title
             content.append(Paragraph(
                 f"<b>{exp['title']}</b> - {exp['company']}",
-                ParagraphStyle('ExperienceHeader', parent=normal_style, spaceBefore=8)
+                experience_header_style
             ))
-            
+
             # Dates
             date_text = f"{exp['startDate']} - {'Present' if exp['current'] else exp['endDate']}"
-            content.append(Paragraph(date_text, ParagraphStyle(
-                'ExperienceDates',
-                parent=normal_style,
-                textColor=colors.gray
-            )))
-            
+            content.append(Paragraph(date_text, experience_dates_style))
+
             # Responsibilities
             for resp in exp['responsibilities']:
                 if resp.strip():
-                    content.append(Paragraph(f"• {resp}", ParagraphStyle(
-                        'Bullet',
-                        parent=normal_style,
-                        leftIndent=20,
-                        spaceBefore=6
-                    )))
-            
+                    content.append(Paragraph(f"• {resp}", bullet_style))
+
             content.append(Spacer(1, 12))
-    
+
     # Education
     if resume_data['education']:
         content.append(Paragraph('Education', heading_style))
-        
+
         for edu in resume_data['education']:
             content.append(Paragraph(
                 f"<b>{edu['degree']}</b>",
-                ParagraphStyle('EducationHeader', parent=normal_style, spaceBefore=8)
+                education_header_style
             ))
             content.append(Paragraph(
                 f"{edu['school']}, {edu['location']}",
@@ -128,43 +147,128 @@ def generate_resume(job_role: str, resume_data: dict) -> str:
             if edu['graduationDate']:
                 content.append(Paragraph(
                     f"Graduation: {edu['graduationDate']}",
-                    ParagraphStyle('EducationDate', parent=normal_style, textColor=colors.gray)
+                    education_date_style
                 ))
-            
+
             content.append(Spacer(1, 12))
-    
+
     # Projects
     if resume_data['projects']:
         content.append(Paragraph('Projects', heading_style))
-        
+
         for project in resume_data['projects']:
             content.append(Paragraph(
                 f"<b>{project['name']}</b>",
-                ParagraphStyle('ProjectHeader', parent=normal_style, spaceBefore=8)
+                project_header_style
             ))
-            
+
             if project['technologies']:
                 content.append(Paragraph(
                     f"<i>Technologies:</i> {project['technologies']}",
                     normal_style
                 ))
-            
+
             if project['description']:
-                content.append(Paragraph(project['description'], ParagraphStyle(
-                    'ProjectDescription',
-                    parent=normal_style,
-                    leftIndent=20,
-                    spaceBefore=6
-                )))
-            
+                content.append(Paragraph(project['description'], project_description_style))
+
             if project['link']:
                 content.append(Paragraph(
                     f"Link: {project['link']}",
-                    ParagraphStyle('ProjectLink', parent=normal_style, textColor=colors.blue)
+                    project_link_style
                 ))
-            
+
             content.append(Spacer(1, 12))
-    
+
     # Build the PDF
     doc.build(content)
-    return filename 
\ No newline at end of file
+    return buffer.getvalue()
+
+def tailor_resume_data(resume_data: dict, target_skills: List[str]) -> dict:
+    """Return a copy of the resume data with the target role's skills listed first."""
+    targets = {skill.lower(): rank for rank, skill in enumerate(target_skills)}
+    skills = resume_data['skills']
+
+    def prioritized(skill_list: List[str]) -> List[str]:
+        return sorted(skill_list, key=lambda skill: targets.get(skill.lower(), len(targets)))
+
+    return {
+        **resume_data,
+        'skills': {
+            **skills,
+            'technical': prioritized(skills['technical']),
+            'soft': prioritized(skills['soft'])
+        }
+    }
+
+def get_executor() -> ProcessPoolExecutor:
+    """The resume worker pool, started on first use; also runs queued render jobs."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=RESUME_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+async def generate_resume_async(job_role: str, resume_data: dict) -> bytes:
+    """Render a resume on the worker pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), generate_resume, job_role, resume_data)
+
+class _ZipSink:
+    """Write-only, non-seekable file object collecting zip output until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+async def generate_resumes_zip(resumes: Dict[str, tuple]) -> AsyncIterator[bytes]:
+    """
+    Render several resumes in parallel on the worker pool and stream a ZIP
+    archive, adding each PDF as soon as it is rendered. `resumes` maps the
+    archive file name to the (job_role, resume_data) arguments of
+    generate_resume. A failed render is recorded as a .txt entry instead.
+    """
+    async def render(name: str, job_role: str, resume_data: dict):
+        try:
+            return name, await generate_resume_async(job_role, resume_data), None
+        except Exception as e:
+            return name, None, str(e)
+
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+    pending = [render(name, job_role, resume_data) for name, (job_role, resume_data) in resumes.items()]
+
+    for next_done in asyncio.as_completed(pending):
+        name, pdf_bytes, error = await next_done
+        if error is None:
+            archive.writestr(name, pdf_bytes)
+        else:
+            archive.writestr(f"{os.path.splitext(name)[0]}.error.txt", f"Could not generate resume: {error}")
+        yield sink.drain()
+
+    archive.close()
+    yield sink.drain()
+
+def shutdown():
+    """Stop the worker pool, waiting for running renders."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
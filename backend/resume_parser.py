@@ -0,0 +1,127 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import pdfplumber
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Worker processes shared by every extraction
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 2)))
+# Pages handled by a single task; larger documents are fanned out across workers
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+# Documents with more pages than this are rejected before any text is extracted
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+# Wall-clock budget for extracting one document
+PDF_TIMEOUT_SECONDS = float(os.getenv("PDF_TIMEOUT_SECONDS", "30"))
+# Address-space limit of each worker process, 0 disables it
+PDF_MEMORY_LIMIT_MB = int(os.getenv("PDF_MEMORY_LIMIT_MB", "1024"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+class PDFExtractionError(Exception):
+    """Raised when a PDF cannot be extracted within its page, time or memory budget."""
+
+def _init_worker(memory_limit_mb: int):
+    if resource is not None and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _on_timeout(signum, frame):
+    raise TimeoutError()
+
+def _extract_pages(contents: bytes, start: int, stop: int, deadline: float, max_pages: int) -> Tuple[List[str], int]:
+    """Extract pages [start, stop) of a PDF, returning their text and the document page count."""
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise PDFExtractionError("PDF extraction timed out")
+
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        with pdfplumber.open(io.BytesIO(contents)) as pdf:
+            page_count = len(pdf.pages)
+            if page_count > max_pages:
+                raise PDFExtractionError(f"PDF has {page_count} pages, the maximum is {max_pages}")
+            texts = [page.extract_text() or "" for page in pdf.pages[start:stop]]
+            return texts, page_count
+    except TimeoutError:
+        raise PDFExtractionError("PDF extraction timed out")
+    except MemoryError:
+        raise PDFExtractionError("PDF extraction exceeded the memory limit")
+    except PDFExtractionError:
+        raise
+    except Exception as e:
+        raise PDFExtractionError(f"Could not read PDF: {e}")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(PDF_MEMORY_LIMIT_MB,)
+        )
+    return _executor
+
+async def extract_text_async(contents: bytes) -> str:
+    """
+    Extract the text of a PDF on the worker pool without blocking the event loop.
+    The first pages are extracted together with the page count; the rest of a
+    large document is split into chunks extracted in parallel and joined once.
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    deadline = time.time() + PDF_TIMEOUT_SECONDS
+
+    async def run(start: int, stop: int) -> Tuple[List[str], int]:
+        return await loop.run_in_executor(
+            executor, _extract_pages, contents, start, stop, deadline, PDF_MAX_PAGES
+        )
+
+    try:
+        texts, page_count = await asyncio.wait_for(
+            run(0, PDF_PAGES_PER_TASK), PDF_TIMEOUT_SECONDS
+        )
+        if page_count > PDF_PAGES_PER_TASK:
+            chunks = await asyncio.wait_for(
+                asyncio.gather(*[
+                    run(start, start + PDF_PAGES_PER_TASK)
+                    for start in range(PDF_PAGES_PER_TASK, page_count, PDF_PAGES_PER_TASK)
+                ]),
+                max(deadline - time.time(), 0)
+            )
+            for chunk, _ in chunks:
+                texts.extend(chunk)
+    except asyncio.TimeoutError:
+        raise PDFExtractionError("PDF extraction timed out")
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool for the next request
+        _executor = None
+        executor.shutdown(wait=False)
+        raise PDFExtractionError("PDF extraction worker crashed")
+
+    return "\n".join(texts)
+
+def shutdown():
+    """Stop the worker pool, waiting for running extractions."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,153 @@
+import re
+from typing import Dict, Iterable, List, Set
+
+
+# After a skill ending in a letter, an attached version number is allowed ("Python3", "Vue.js3")
+_VERSION_SUFFIX = r"\d*(?:\.\d+)*(?!\w)"
+_VERSION_END = re.compile(_VERSION_SUFFIX)
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _start_assertion(first: str) -> str:
+    """Boundary before a skill; only needed when the skill starts with a word character."""
+    return r"(?<!\w)" if _is_word(first) else ""
+
+
+def _end_assertion(last: str) -> str:
+    """Boundary after a skill; skills ending in punctuation ("C++", "C#") need none."""
+    if not _is_word(last):
+        return ""
+    if last.isdigit():
+        return r"(?!\w)"
+    return f"(?={_VERSION_SUFFIX})"
+
+
+def _starts_at(text: str, start: int, key: str) -> bool:
+    return start == 0 or not _is_word(key[0]) or not _is_word(text[start - 1])
+
+
+def _ends_at(text: str, end: int, key: str) -> bool:
+    """Whether a skill ending just before `end` is on a boundary, by the rules of _end_assertion."""
+    last = key[-1]
+    if not _is_word(last) or end == len(text):
+        return True
+    if last.isdigit():
+        return not _is_word(text[end])
+    return _VERSION_END.match(text, end) is not None
+
+
+def _trie_pattern(node: Dict, last: str = "") -> str:
+    """
+    Turn a character trie into a prefix-factored regex alternation, with the
+    end boundary each skill's last character calls for.
+    """
+    branches = [re.escape(char) + _trie_pattern(child, char) for char, child in sorted(node.items()) if char != ""]
+
+    if "" in node:
+        end = _end_assertion(last)
+        if not branches:
+            return end
+        if not end:
+            return "(?:" + "|".join(branches) + ")?"
+        # Longer skills are tried first, like a greedy optional group
+        return "(?:" + "|".join(branches + [end]) + ")"
+
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def _matcher_pattern(trie: Dict) -> str:
+    """
+    The full matcher: a zero-width lookahead at each skill start, so matches
+    starting inside a previous match are still found.
+    """
+    if all(_is_word(char) for char in trie):
+        # Every skill starts with a word character: one cheap boundary check up front
+        return r"(?<!\w)(?=(" + _trie_pattern(trie) + r"))"
+
+    branches = [
+        _start_assertion(char) + re.escape(char) + _trie_pattern(child, char)
+        for char, child in sorted(trie.items())
+    ]
+    return r"(?:(?<!\w)|(?=\W))(?=((?:" + "|".join(branches) + r")))"
+
+
+class SkillMatcher:
+    """
+    Finds catalog skills in free text in a single pass.
+
+    The skill names are compiled once into a prefix-factored regex that only
+    matches on word boundaries, so "R" or "Go" are not found inside ordinary
+    words. Boundaries apply only on a side where the skill has a word
+    character, so "C++17" still finds "C++", and a version number may follow
+    a skill ending in a letter ("Python3"). Skills nested inside a longer
+    skill at the same position (e.g. "React" in "React Native") are
+    precomputed per skill.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        # Canonical name per lowercase skill, first occurrence wins
+        self.canonical: Dict[str, str] = {}
+        for skill in skills:
+            key = skill.strip().lower()
+            if key and key not in self.canonical:
+                self.canonical[key] = skill.strip()
+
+        self._order = {key: index for index, key in enumerate(self.canonical)}
+
+        trie: Dict = {}
+        for key in self.canonical:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        self._pattern = re.compile(_matcher_pattern(trie), re.IGNORECASE) if self.canonical else None
+
+        self._trie = trie
+        self._nested: Dict[str, Set[str]] = {key: self._contained(key) for key in self.canonical}
+
+    def _contained(self, key: str) -> Set[str]:
+        """Every catalog skill appearing on boundaries inside a skill name, by the matching rules."""
+        contained = set()
+        for start in range(len(key)):
+            node = self._trie
+            for end in range(start, len(key)):
+                node = node.get(key[end])
+                if node is None:
+                    break
+                skill = key[start:end + 1]
+                if "" in node and _starts_at(key, start, skill) and _ends_at(key, end + 1, skill):
+                    contained.add(skill)
+        return contained
+
+    def _scan(self, text: str) -> Set[str]:
+        if self._pattern is None:
+            return set()
+        return {match.group(1).lower() for match in self._pattern.finditer(text)}
+
+    def find_keys(self, text: str) -> Set[str]:
+        """Return the lowercase keys of every skill mentioned in the text."""
+        found = set()
+        for key in self._scan(text):
+            found |= self._nested.get(key, {key})
+        return found
+
+    def find(self, text: str) -> List[str]:
+        """
+        Return every skill mentioned in the text, in catalog order.
+
+        >>> matcher = SkillMatcher(["Python", "C++", "Vue.js", "Go", "R"])
+        >>> matcher.find("Modern C++17 and C++20")
+        ['C++']
+        >>> matcher.find("Python3, Vue.js3")
+        ['Python', 'Vue.js']
+        >>> matcher.find("Google, Rust and R")
+        ['R']
+        """
+        found = self.find_keys(text)
+        return [self.canonical[key] for key in sorted(found, key=self._order.__getitem__)]
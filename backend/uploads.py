@@ -0,0 +1,105 @@
+import hashlib
+import os
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Largest resume accepted
+UPLOAD_MAX_BYTES = int(float(os.getenv("UPLOAD_MAX_MB", "10")) * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the multipart boundaries, headers and small form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# The PDF header may follow a little leading junk; the trailer may be followed by line ends or padding
+PDF_HEADER_WINDOW = 1024
+PDF_TRAILER_WINDOW = 1024
+
+class NotAPDF(Exception):
+    """Raised when an upload does not start with a PDF header."""
+
+class IncompletePDF(Exception):
+    """Raised when an upload has a PDF header but no %%EOF trailer, e.g. a truncated file."""
+
+class UploadLimitMiddleware:
+    """
+    Rejects multipart requests larger than the upload limit with 413: at once
+    when Content-Length is too large, otherwise as soon as the streamed body
+    passes the limit, so oversized bodies are never received in full.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int = UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse({"detail": "Upload too large"}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised while the form is parsed, which FastAPI turns into the response
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, receive_limited, send)
+
+def _check_pdf(f: BinaryIO) -> str:
+    """Check the header and trailer of a PDF file object in place and return its SHA-256."""
+    f.seek(0)
+    if b"%PDF-" not in f.read(PDF_HEADER_WINDOW):
+        raise NotAPDF("The uploaded file is not a PDF")
+
+    size = f.seek(0, os.SEEK_END)
+    f.seek(max(0, size - PDF_TRAILER_WINDOW))
+    if b"%%EOF" not in f.read():
+        raise IncompletePDF("The uploaded PDF is incomplete")
+
+    f.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+class CheckedUpload:
+    """An uploaded file known to be a complete PDF, with its SHA-256."""
+
+    def __init__(self, file: UploadFile, sha256: str):
+        self.file = file
+        self.sha256 = sha256
+
+    def read(self) -> bytes:
+        self.file.file.seek(0)
+        return self.file.file.read()
+
+async def receive_pdf(file: UploadFile) -> CheckedUpload:
+    """
+    Check an upload where it already lies, in the request's spooled file:
+    raises NotAPDF if the first bytes show it is not a PDF and IncompletePDF
+    if the %%EOF trailer is missing, both before the PDF is parsed. Its size
+    is already bounded by UploadLimitMiddleware.
+    """
+    # The spooled file may be on disk, so it is read off the event loop
+    sha256 = await run_in_threadpool(_check_pdf, file.file)
+    return CheckedUpload(file, sha256)